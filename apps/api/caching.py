@@ -0,0 +1,125 @@
+import hashlib
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db import models, transaction
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+RESPONSE_KEY_PREFIX = "api:response"
+TAG_KEY_PREFIX = "api:response_tag"
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized data of successful GET responses for DRF views.
+
+    For example:
+
+    class UserListApi(CachedResponseMixin, generics.ListAPIView):
+        cache_models = [BaseUser]
+        cache_timeout = 60
+        ...
+
+    The key is built from the host & path (the data has absolute pagination links),
+    the normalized query params (filters, cursor,
+    etc.) and the requesting user, so permission-filtered querysets are never shared
+    between users. Authentication & permission checks still run on every request,
+    only the handler (queries + serialization) is skipped on a hit.
+
+    Entries are tagged with `cache_models`. Any `post_save`/`post_delete` (which
+    covers `model_update`) or `post_bulk_update` of those models invalidates all
+    entries tagged with them (see api.signals). Tags are versioned, so invalidation
+    is a single cache write per transaction, no matter how many responses are
+    cached or how many rows were written.
+
+    The receivers are connected when the view class is defined, so a process writing
+    to `cache_models` (e.g. a Celery worker, with a shared cache) has to import the
+    view for its writes to invalidate.
+    """
+
+    cache_models: Iterable[type[models.Model]] = ()
+    cache_timeout: int | None = 60
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        from apps.api.signals import response_cache_connect
+
+        for model in cls.cache_models:
+            response_cache_connect(model=model)
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+
+        if cached is not None:
+            return Response(cached)
+
+        response = super().get(request, *args, **kwargs)  # type: ignore[misc]
+
+        if response.status_code == 200:
+            cache.set(key, response.data, timeout=self.cache_timeout)
+
+        return response
+
+    def get_response_cache_key(self, request: Request) -> str:
+        query_params = sorted(
+            (param, sorted(request.query_params.getlist(param)))
+            for param in request.query_params
+        )
+        identity = request.user.pk if request.user.is_authenticated else "anon"
+        tags = response_cache_tag_versions(
+            labels=[model._meta.label for model in self.cache_models]
+        )
+
+        raw_key = repr((request.get_host(), request.path, query_params, identity, tags))
+        digest = hashlib.md5(raw_key.encode(), usedforsecurity=False).hexdigest()
+
+        return f"{RESPONSE_KEY_PREFIX}:{self.__class__.__qualname__}:{digest}"
+
+
+def response_cache_tag_versions(*, labels: list[str]) -> list[str]:
+    """
+    Returns the current version of every tag, creating the missing ones.
+    """
+    keys = [f"{TAG_KEY_PREFIX}:{label}" for label in labels]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+@dataclass
+class _ResponseCacheTagBump:
+    # A dataclass, so a pending bump of the same tag compares equal
+    key: str
+    done: bool = field(default=False, compare=False)
+
+    def __call__(self) -> None:
+        cache.set(self.key, uuid.uuid4().hex, timeout=None)
+        self.done = True
+
+
+def response_cache_invalidate(*, model: type[models.Model]) -> None:
+    """
+    Orphans every cached response tagged with `model`. Deferred until the current
+    transaction commits, so a concurrent GET can't re-cache the old data, & done
+    once per transaction, however many of its rows were written.
+    """
+    bump = _ResponseCacheTagBump(f"{TAG_KEY_PREFIX}:{model._meta.label}")
+    connection = transaction.get_connection()
+
+    # Rolled back savepoints drop their callbacks, so those bumps are redone
+    if connection.in_atomic_block and any(
+        func == bump and not func.done for _, func, _ in connection.run_on_commit
+    ):
+        return
+
+    transaction.on_commit(bump)
@@ -0,0 +1,102 @@
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class ConditionalResponseMixin:
+    """
+    Conditional GET (ETag / Last-Modified) for generic list & detail views over a
+    `BaseModel` subclass.
+
+    For example:
+
+    class UserListApi(ConditionalResponseMixin, generics.ListAPIView):
+        ...
+
+    Validators are derived from `BaseModel.updated_at`:
+        - list: an `ETag` from `MAX(updated_at)` & the row count of the filtered
+          queryset, so edits, additions and deletions all change it. Computed in one
+          aggregate query, before the page is fetched. No `Last-Modified`, since a
+          deletion doesn't change `MAX(updated_at)`, so clients sending only
+          `If-Modified-Since` would keep getting 304s.
+        - detail: an `ETag` & `Last-Modified` from the object's `updated_at`, from
+          the object fetched by `get_object`.
+
+    If the request's validators still match, a 304 is returned before any
+    serialization happens. Otherwise the regular response gets the validators.
+
+    Note that `QuerySet.update()` doesn't bump `updated_at` by itself.
+    """
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+        stats = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("pk")
+        )
+        etag = self._make_etag(f"{stats['count']}:{stats['last_modified']}")
+
+        not_modified = self._get_not_modified(request, etag, last_modified=None)
+
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        return self._set_validators(response, etag, last_modified=None)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        instance = self.get_object()  # type: ignore[attr-defined]
+        etag = self._make_etag(f"{instance.pk}:{instance.updated_at}")
+        last_modified = instance.updated_at
+
+        not_modified = self._get_not_modified(request, etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)  # type: ignore[attr-defined]
+
+        return self._set_validators(Response(serializer.data), etag, last_modified)
+
+    def _get_not_modified(
+        self, request: Request, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase | None:
+        response = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=self._to_timestamp(last_modified),
+        )
+
+        if response is not None:
+            self._set_validators(response, etag, last_modified)
+
+        return response
+
+    def _set_validators[R: HttpResponseBase](
+        self, response: R, etag: str, last_modified: datetime | None
+    ) -> R:
+        if response.status_code not in (200, 304):
+            return response
+
+        response["ETag"] = etag
+
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(self._to_timestamp(last_modified))
+
+        return response
+
+    @staticmethod
+    def _to_timestamp(value: datetime | None) -> int | None:
+        return int(value.timestamp()) if value is not None else None
+
+    @staticmethod
+    def _make_etag(value: str) -> str:
+        digest = hashlib.md5(value.encode(), usedforsecurity=False).hexdigest()
+
+        return f'W/"{digest}"'
@@ -0,0 +1,177 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from apps.common.models import BaseModel
+
+
+class Cursor(NamedTuple):
+    created_at: datetime
+    pk: Any
+    reverse: bool
+
+
+class BaseModelCursorPagination(BasePagination):
+    """
+    Keyset (a.k.a. seek) pagination for any `BaseModel` subclass.
+
+    Results are ordered newest first by the indexed `created_at` column, with the
+    primary key as a tiebreaker. The cursor is an opaque, url-safe encoding of the
+    `(created_at, pk)` position, so every page is a single indexed range query,
+    no matter how deep it is. `COUNT(*)` is never issued.
+
+    The response shape is:
+    {
+        "next": "<url or null>",
+        "previous": "<url or null>",
+        "results": [...]
+    }
+    """
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet[BaseModel], request: Request, view=None
+    ) -> list[BaseModel] | None:
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request, queryset.model)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        if reverse:
+            queryset = queryset.order_by("created_at", "pk")
+        else:
+            queryset = queryset.order_by("-created_at", "-pk")
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self._seek_condition(self.cursor))
+
+        # One extra row tells us whether there is another page in this direction
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else self.cursor is not None
+
+        return results
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request: Request) -> int | None:
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+
+        return self.page_size
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+
+        last = self.page[-1]
+
+        return self.encode_cursor(Cursor(last.created_at, last.pk, reverse=False))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+
+        first = self.page[0]
+
+        return self.encode_cursor(Cursor(first.created_at, first.pk, reverse=True))
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        payload = json.dumps(
+            [cursor.created_at.isoformat(), cursor.pk, int(cursor.reverse)],
+            separators=(",", ":"),
+        )
+        encoded = urlsafe_b64encode(payload.encode()).decode()
+
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request: Request, model: type[BaseModel]) -> Cursor | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            created_at, pk, reverse = json.loads(urlsafe_b64decode(encoded.encode()))
+            # A well-formed cursor can still carry a pk the column can't compare to
+            pk = model._meta.pk.to_python(pk)
+            return Cursor(datetime.fromisoformat(created_at), pk, bool(reverse))
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def _seek_condition(self, cursor: Cursor) -> Q:
+        # Rows strictly after the cursor, in the direction we are paginating
+        op = "gt" if cursor.reverse else "lt"
+
+        return Q(**{f"created_at__{op}": cursor.created_at}) | Q(
+            created_at=cursor.created_at, **{f"pk__{op}": cursor.pk}
+        )
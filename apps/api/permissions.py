@@ -0,0 +1,13 @@
+from rest_framework import permissions
+
+
+class IsAdmin(permissions.BasePermission):
+    """
+    `BaseUser.is_staff` is a method (so always truthy as an attribute), which makes
+    DRF's `IsAdminUser` unusable here. This checks `is_admin` directly.
+    """
+
+    def has_permission(self, request, view) -> bool:
+        user = request.user
+
+        return bool(user and user.is_authenticated and user.is_admin)
@@ -0,0 +1,25 @@
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+
+from apps.api.caching import response_cache_invalidate
+from apps.common.signals import post_bulk_update
+
+
+def response_cache_invalidate_on_write(sender, **kwargs) -> None:
+    response_cache_invalidate(model=sender)
+
+
+def response_cache_connect(*, model: type[models.Model]) -> None:
+    """
+    Connects the invalidation to the writes of `model`, for every model in a
+    `CachedResponseMixin.cache_models`.
+
+    Only for those models: a `post_delete` receiver turns off Django's fast deletes
+    for its sender, since every row has to be loaded to be sent.
+    """
+    for signal in (post_save, post_delete, post_bulk_update):
+        signal.connect(
+            response_cache_invalidate_on_write,
+            sender=model,
+            dispatch_uid=f"response_cache_invalidate:{model._meta.label}",
+        )
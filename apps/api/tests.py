@@ -1,3 +1,416 @@
-from django.test import TestCase
+import json
+import logging
+from base64 import urlsafe_b64encode
 
-# Create your tests here.
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.deletion import Collector
+from django.http import Http404
+from rest_framework import exceptions, generics, serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.api.caching import CachedResponseMixin
+from apps.api.conditional import ConditionalResponseMixin
+from apps.api.exception_handlers import (
+    ExceptionMappers,
+    error_response,
+    improved_exception_handler,
+    simple_mapping_exception_handler,
+)
+from apps.api.pagination import BaseModelCursorPagination
+from apps.common.exceptions import ApplicationError
+from apps.common.services import model_update
+from apps.users.models import BaseUser
+from apps.users.services import user_create, user_list
+
+factory = APIRequestFactory()
+
+
+class UserListApi(CachedResponseMixin, generics.ListAPIView):
+    class OutputSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        email = serializers.EmailField()
+        is_admin = serializers.BooleanField()
+
+    cache_models = [BaseUser]
+    serializer_class = OutputSerializer
+    filterset_fields = ["is_admin"]
+
+    def get_queryset(self):
+        return user_list()
+
+
+def _paginate(
+    url: str | None, page_size: int = 2
+) -> tuple[list, str | None, str | None]:
+    assert url is not None
+
+    paginator = BaseModelCursorPagination()
+    paginator.page_size = page_size
+
+    page = paginator.paginate_queryset(user_list(), Request(factory.get(url)))
+    assert page is not None
+
+    return page, paginator.get_next_link(), paginator.get_previous_link()
+
+
+@pytest.fixture
+def users(db) -> list[BaseUser]:
+    users = [user_create(email=f"user_{i}@example.com") for i in range(5)]
+    # Same timestamp for some, so the pk tiebreaker has to do the work
+    BaseUser.objects.filter(pk__in=[u.pk for u in users[1:4]]).update(
+        created_at=users[1].created_at
+    )
+
+    return sorted(
+        BaseUser.objects.all(), key=lambda u: (u.created_at, u.pk), reverse=True
+    )
+
+
+def test_cursor_pagination_walks_forward_and_back(users: list[BaseUser]):
+    page_1, next_url, previous_url = _paginate("/users")
+    assert page_1 == users[:2]
+    assert previous_url is None
+
+    page_2, next_url, previous_url = _paginate(next_url)
+    assert page_2 == users[2:4]
+
+    page_3, next_url, previous_url = _paginate(next_url)
+    assert page_3 == users[4:]
+    assert next_url is None
+
+    page_2_again, _, previous_url = _paginate(previous_url)
+    assert page_2_again == users[2:4]
+
+    page_1_again, _, previous_url = _paginate(previous_url)
+    assert page_1_again == users[:2]
+    assert previous_url is None
+
+
+def test_cursor_pagination_never_counts(
+    users: list[BaseUser], django_assert_num_queries
+):
+    with django_assert_num_queries(1) as ctx:
+        _paginate("/users?page_size=3")
+
+    assert "COUNT" not in ctx.captured_queries[0]["sql"]
+
+
+@pytest.mark.parametrize(
+    "payload", [b"not-a-cursor", b'["2024-01-01T00:00:00+00:00","abc",0]']
+)
+def test_cursor_pagination_rejects_invalid_cursor(db, payload: bytes):
+    cursor = urlsafe_b64encode(payload).decode()
+
+    with pytest.raises(NotFound):
+        _paginate(f"/users?cursor={cursor}")
+
+
+class ConditionalUserListApi(ConditionalResponseMixin, generics.ListAPIView):
+    serializer_class = UserListApi.OutputSerializer
+
+    def get_queryset(self):
+        return user_list()
+
+
+class ConditionalUserDetailApi(ConditionalResponseMixin, generics.RetrieveAPIView):
+    serializer_class = UserListApi.OutputSerializer
+
+    def get_queryset(self):
+        return user_list()
+
+
+@pytest.fixture
+def user_list_api(db, django_capture_on_commit_callbacks):
+    cache.clear()
+
+    def _get(url: str = "/users") -> list[dict]:
+        # Writes invalidate the cache on commit
+        with django_capture_on_commit_callbacks(execute=True):
+            response = UserListApi.as_view()(factory.get(url))
+            response.render()
+
+        return [row["email"] for row in response.data["results"]]
+
+    return _get
+
+
+def test_cached_response_skips_the_database_on_hit(
+    user_list_api, django_assert_num_queries
+):
+    user_create(email="user@example.com")
+    assert user_list_api() == ["user@example.com"]
+
+    with django_assert_num_queries(0):
+        assert user_list_api() == ["user@example.com"]
+
+
+def test_cached_response_is_keyed_on_query_params(user_list_api):
+    user_create(email="user@example.com")
+    user_create(email="admin@example.com", is_admin=True)
+
+    assert user_list_api("/users?is_admin=true") == ["admin@example.com"]
+    assert user_list_api("/users?is_admin=false") == ["user@example.com"]
+
+
+def test_cached_response_is_invalidated_on_model_writes(
+    user_list_api, django_capture_on_commit_callbacks
+):
+    # Committed, like the writes below. Bumps pending in the test's transaction
+    # would be merged with them.
+    with django_capture_on_commit_callbacks(execute=True):
+        user = user_create(email="user@example.com")
+
+    assert user_list_api("/users?is_admin=true") == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        model_update(instance=user, fields=["is_admin"], data={"is_admin": True})
+
+    assert user_list_api("/users?is_admin=true") == ["user@example.com"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+
+    assert user_list_api("/users?is_admin=true") == []
+
+
+def test_cached_response_is_keyed_on_the_host(user_list_api, settings, monkeypatch):
+    settings.ALLOWED_HOSTS = ["a.example.com", "b.example.com"]
+    monkeypatch.setattr(BaseModelCursorPagination, "page_size", 1)
+    user_create(email="user_1@example.com")
+    user_create(email="user_2@example.com")
+
+    for host in settings.ALLOWED_HOSTS:
+        response = UserListApi.as_view()(factory.get("/users", HTTP_HOST=host))
+
+        assert response.data["next"].startswith(f"http://{host}/users?")
+
+
+def test_cached_response_invalidates_once_per_transaction(
+    db, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        for i in range(3):
+            user_create(email=f"user_{i}@example.com")
+
+        BaseUser.objects.all().delete()
+
+    assert len(callbacks) == 1
+
+
+def test_cached_response_keeps_fast_deletes_for_other_models(db):
+    assert not Collector(using="default").can_fast_delete(BaseUser.objects.all())
+    assert Collector(using="default").can_fast_delete(Session.objects.all())
+
+
+def test_conditional_list_returns_304_until_the_list_changes(db):
+    user = user_create(email="user@example.com")
+    view = ConditionalUserListApi.as_view()
+
+    response = view(factory.get("/users"))
+    etag = response["ETag"]
+    assert response.status_code == 200
+    assert etag.startswith('W/"')
+
+    response = view(factory.get("/users", HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    model_update(instance=user, fields=["is_admin"], data={"is_admin": True})
+
+    response = view(factory.get("/users", HTTP_IF_NONE_MATCH=etag))
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_conditional_list_changes_etag_on_delete(db):
+    user_create(email="user@example.com")
+    other = user_create(email="other@example.com")
+    view = ConditionalUserListApi.as_view()
+
+    response = view(factory.get("/users"))
+    etag = response["ETag"]
+    other.delete()
+
+    assert view(factory.get("/users", HTTP_IF_NONE_MATCH=etag)).status_code == 200
+    # MAX(updated_at) stays the same after a delete, so it can't be a validator
+    assert not response.has_header("Last-Modified")
+    since = "Fri, 01 Jan 2100 00:00:00 GMT"
+    assert view(factory.get("/users", HTTP_IF_MODIFIED_SINCE=since)).status_code == 200
+
+
+def test_conditional_detail_skips_serialization_when_not_modified(
+    db, django_assert_num_queries
+):
+    user = user_create(email="user@example.com")
+    view = ConditionalUserDetailApi.as_view()
+
+    response = view(factory.get("/users/1"), pk=user.pk)
+    assert response.data["email"] == user.email
+
+    with django_assert_num_queries(1):
+        response = view(
+            factory.get("/users/1", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]),
+            pk=user.pk,
+        )
+
+    assert response.status_code == 304
+
+
+def _rendered(response) -> tuple[int, dict]:
+    return response.status_code, json.loads(JSONRenderer().render(response.data))
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (
+            ApplicationError("Nope", {"reason": "test"}),
+            (400, {"message": "Nope", "extra": {"reason": "test"}}),
+        ),
+        (
+            exceptions.ValidationError({"email": ["Invalid"]}),
+            (
+                400,
+                {
+                    "message": "Validation error",
+                    "extra": {"fields": {"email": ["Invalid"]}},
+                },
+            ),
+        ),
+        (
+            exceptions.ValidationError("Invalid"),
+            (400, {"message": "Validation error", "extra": {"fields": ["Invalid"]}}),
+        ),
+        (
+            DjangoValidationError("Invalid"),
+            (
+                400,
+                {
+                    "message": "Validation error",
+                    "extra": {"fields": {"non_field_errors": ["Invalid"]}},
+                },
+            ),
+        ),
+        (
+            DjangoValidationError({"email": "Invalid"}),
+            (
+                400,
+                {
+                    "message": "Validation error",
+                    "extra": {"fields": {"email": ["Invalid"]}},
+                },
+            ),
+        ),
+        (
+            exceptions.NotAuthenticated(),
+            (
+                401,
+                {
+                    "message": "Authentication credentials were not provided.",
+                    "extra": {},
+                },
+            ),
+        ),
+        (Http404("Missing"), (404, {"message": "Not found.", "extra": {}})),
+        (
+            PermissionDenied(),
+            (
+                403,
+                {
+                    "message": "You do not have permission to perform this action.",
+                    "extra": {},
+                },
+            ),
+        ),
+    ],
+)
+def test_improved_exception_handler(exc: Exception, expected: tuple[int, dict]):
+    assert _rendered(improved_exception_handler(exc, {})) == expected
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (
+            exceptions.ValidationError({"email": ["Invalid"]}),
+            (400, {"detail": {"email": ["Invalid"]}}),
+        ),
+        (
+            DjangoValidationError("Invalid"),
+            (400, {"detail": {"non_field_errors": ["Invalid"]}}),
+        ),
+        (exceptions.NotFound(), (404, {"detail": "Not found."})),
+        (Http404("Missing"), (404, {"detail": "Not found."})),
+    ],
+)
+def test_simple_mapping_exception_handler(exc: Exception, expected: tuple[int, dict]):
+    assert _rendered(simple_mapping_exception_handler(exc, {})) == expected
+
+
+def test_exception_handlers_leave_unknown_exceptions_to_a_500():
+    assert improved_exception_handler(RuntimeError(), {}) is None
+    assert simple_mapping_exception_handler(ApplicationError("Nope"), {}) is None
+
+
+def test_exception_handler_keeps_api_exception_headers():
+    response = improved_exception_handler(exceptions.Throttled(wait=3), {})
+
+    assert response.status_code == 429
+    assert response["Retry-After"] == "3"
+
+
+def test_exception_mappers_resolve_the_closest_registered_class():
+    class PaymentError(ApplicationError):
+        pass
+
+    class PaymentDeclined(PaymentError):
+        pass
+
+    mappers = ExceptionMappers(
+        {ApplicationError: lambda exc, ctx: error_response(exc.message)}
+    )
+
+    assert _rendered(mappers.handle(PaymentDeclined("Declined"), {}))[0] == 400
+
+    # Registering after a subclass was resolved still takes effect
+    @mappers.register(PaymentError)
+    def payment_error(exc: PaymentError, ctx: dict):
+        return error_response(exc.message, status=402)
+
+    assert _rendered(mappers.handle(PaymentDeclined("Declined"), {})) == (
+        402,
+        {"message": "Declined", "extra": {}},
+    )
+    assert mappers.resolve(ApplicationError) is not payment_error
+    assert mappers.resolve(ValueError) is None
+
+
+@pytest.fixture
+def error_log(caplog, monkeypatch):
+    # Kept away from root's handlers, which would send it off to the admins
+    logger = logging.getLogger("apps.api.exception_handlers")
+    monkeypatch.setattr(logger, "propagate", False)
+    logger.addHandler(caplog.handler)
+
+    yield caplog
+
+    logger.removeHandler(caplog.handler)
+
+
+def test_exception_handler_logs_server_errors_with_the_exception(error_log):
+    request = factory.get("/users")
+    exc = exceptions.APIException("Upstream is down")
+
+    response = improved_exception_handler(exc, {"request": Request(request)})
+
+    assert response.status_code == 500
+    assert response._has_been_logged
+    assert error_log.records[-1].exc_info[1] is exc
+    assert error_log.records[-1].request is request
@@ -2,7 +2,7 @@ from django.urls import include, path
 
 urlpatterns = [
     # path("auth/", include(("apps.authentication.urls", "authentication"))),
-    # path("users/", include(("apps.users.urls", "users"))),
+    path("users/", include(("apps.users.urls", "users"))),
     # path("errors/", include(("apps.errors.urls", "errors"))),
     # path("files/", include(("apps.files.urls", "files"))),
     # path(
@@ -0,0 +1,219 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class SharedFileCache(BaseCache):
+    """
+    A cache shared by all processes on a single host, backed by a SQLite file.
+
+    Meant for single-host deployments without Redis/Memcached, where LocMem gives
+    every gunicorn worker its own cold copy. Reads are served from the OS page cache
+    (point the LOCATION at a tmpfs such as /dev/shm for best results), and WAL mode
+    lets readers & a writer work concurrently.
+
+    Reads never write, so they don't contend for the write lock. Expired entries are
+    only skipped by reads & deleted by the next cull.
+
+    Eviction is an approximate LRU. Reads note the entry's access time in memory, at
+    most once per `ACCESS_RESOLUTION` seconds, & the noted times are written in one
+    batch with the process' next write (or once `ACCESS_BATCH` are pending). Once the
+    cache grows past MAX_ENTRIES the least recently used 1/CULL_FREQUENCY of the
+    entries are dropped, along with anything expired. The size check runs once every
+    `CULL_EVERY` writes per process.
+
+    Configured via config.settings.caches (`CACHE_BACKEND=shared`).
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    ACCESS_RESOLUTION = 1.0
+    ACCESS_BATCH = 100
+    CULL_EVERY = 100
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = os.path.abspath(
+            location or os.path.join(tempfile.gettempdir(), "django_shared_cache.db")
+        )
+        self._local = threading.local()
+        self._writes = 0
+        # key -> access time, not written yet
+        self._accessed: dict[str, float] = {}
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+
+        with self._connection as conn:
+            # Expired entries don't count as present
+            conn.execute("DELETE FROM cache WHERE key = ? AND expires <= ?", (key, now))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO cache (key, value, expires, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self._dumps(value), self._expires(timeout), now),
+            )
+
+            if self._accessed:
+                self._write_accessed(conn)
+
+        self._maybe_cull()
+
+        return cursor.rowcount == 1
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+
+        row = self._connection.execute(
+            "SELECT value, expires, accessed FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return default
+
+        value, expires, accessed = row
+
+        if expires is not None and expires <= now:
+            return default
+
+        if now - accessed >= self.ACCESS_RESOLUTION:
+            self._accessed[key] = now
+
+            if len(self._accessed) >= self.ACCESS_BATCH:
+                with self._connection as conn:
+                    self._write_accessed(conn)
+
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+
+        with self._connection as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, self._dumps(value), self._expires(timeout), time.time()),
+            )
+
+            if self._accessed:
+                self._write_accessed(conn)
+
+        self._maybe_cull()
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+
+        with self._connection as conn:
+            cursor = conn.execute(
+                "UPDATE cache SET expires = ?, accessed = ? "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (self._expires(timeout), now, key, now),
+            )
+
+        return cursor.rowcount == 1
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+
+        with self._connection as conn:
+            cursor = conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+        return cursor.rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+
+        row = self._connection.execute(
+            "SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+
+        return row is not None
+
+    def clear(self):
+        with self._connection as conn:
+            conn.execute("DELETE FROM cache")
+
+    def close(self, **kwargs):
+        # Connections are reused across requests, just like LocMem's dict is
+        pass
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        """
+        One connection per thread & per process. A connection inherited through
+        fork (e.g. gunicorn's preload) must not be used in the child, so it is
+        replaced when the pid changes.
+        """
+        pid = os.getpid()
+        local = self._local
+
+        if getattr(local, "pid", None) != pid:
+            local.connection = self._connect()
+            local.pid = pid
+
+        return local.connection
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+
+        conn = sqlite3.connect(self._path, timeout=5, check_same_thread=False)
+        # It is a cache, losing the last writes on a power cut is fine
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, "
+            "accessed REAL NOT NULL) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+
+        return conn
+
+    def _dumps(self, value) -> bytes:
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _expires(self, timeout) -> float | None:
+        return self.get_backend_timeout(timeout)
+
+    def _write_accessed(self, conn: sqlite3.Connection) -> None:
+        # Swapped first, reads from other threads go to the new dict
+        accessed, self._accessed = self._accessed, {}
+
+        conn.executemany(
+            "UPDATE cache SET accessed = ? WHERE key = ? AND accessed < ?",
+            [(at, key, at) for key, at in accessed.items()],
+        )
+
+    def _maybe_cull(self) -> None:
+        self._writes += 1
+
+        if self._writes % self.CULL_EVERY == 0:
+            self._cull()
+
+    def _cull(self) -> None:
+        with self._connection as conn:
+            self._write_accessed(conn)
+            conn.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+
+            (count,) = conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+
+            if count <= self._max_entries:
+                return
+
+            # Django's convention: CULL_FREQUENCY=0 means clear everything
+            to_delete = (
+                count if self._cull_frequency == 0 else count // self._cull_frequency
+            )
+            conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+                (max(to_delete, count - self._max_entries),),
+            )
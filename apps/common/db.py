@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from apps.common.middleware import record_query
+
+
+@receiver(connection_created)
+def sqlite_connection_setup(sender, connection: BaseDatabaseWrapper, **kwargs) -> None:
+    """
+    Applies `DATABASE_SQLITE_PRAGMAS` to every new SQLite connection.
+    See config.settings.database for what they do.
+
+    Pragmas are per connection (journal_mode is persisted in the file, but setting
+    it again is a no-op), so with CONN_MAX_AGE this runs once per worker thread,
+    not per request.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    pragmas = settings.DATABASE_SQLITE_PRAGMAS
+
+    if not pragmas:
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # Pragmas can't be parametrized. The values come from our settings.
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def query_metrics_connection_setup(
+    sender, connection: BaseDatabaseWrapper, **kwargs
+) -> None:
+    """
+    Installs apps.common.middleware.record_query on every new connection, so that
+    QueryMetricsMiddleware sees the queries of its request, in whichever thread
+    they run.
+
+    It goes first, so that it times the other wrappers too, & so that
+    `connection.execute_wrapper()` blocks, which pop the last wrapper on exit,
+    leave it in place. Connections are reused across reconnects, hence the check.
+    """
+    if not settings.QUERY_METRICS_ENABLED:
+        return
+
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
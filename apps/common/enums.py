@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class QueryBudgetAction(Enum):
+    WARN = "warn"
+    RAISE = "raise"
@@ -4,3 +4,10 @@ class ApplicationError(Exception):
 
         self.message = message
         self.extra = extra or {}
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised by apps.common.middleware.QueryMetricsMiddleware, when a view runs more
+    queries than its budget & QUERY_BUDGET_ACTION is "raise".
+    """
@@ -0,0 +1,239 @@
+import copy
+import functools
+import logging
+import os
+import queue
+import sysconfig
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from django.db import close_old_connections
+from django.http import HttpRequest, QueryDict
+
+# Frames under these are skipped when fingerprinting, in favour of our own code
+LIBRARY_PATHS = tuple(
+    {sysconfig.get_paths()[name] for name in ("stdlib", "purelib", "platlib")}
+)
+
+
+def error_fingerprint(record: logging.LogRecord) -> str:
+    """
+    e.g. "apps.users.services.UserDoesNotExist@/app/apps/users/services.py:42"
+
+    Exceptions are fingerprinted by their type & the innermost frame outside of the
+    standard library & site-packages (the innermost one overall, if there is none).
+    Records without an exception by their logger & message template, not the
+    formatted message, so e.g. "Internal Server Error: %s" is one fingerprint.
+    """
+    if not record.exc_info or record.exc_info[1] is None:
+        return f"{record.name}:{record.msg}@{record.pathname}:{record.lineno}"
+
+    exc_type, _, tb = record.exc_info
+    location = "<unknown>"
+
+    while tb is not None:
+        filename = tb.tb_frame.f_code.co_filename
+
+        if location == "<unknown>" or not filename.startswith(LIBRARY_PATHS):
+            location = f"{filename}:{tb.tb_lineno}"
+
+        tb = tb.tb_next
+
+    return f"{exc_type.__module__}.{exc_type.__qualname__}@{location}"
+
+
+class ErrorAggregatingQueueListener(QueueListener):
+    """
+    Sends the first record per fingerprint & interval to its handlers right away &
+    counts the rest. At the end of the interval, a summary is sent per fingerprint
+    that had more: a copy of the last record, with the count in the message.
+
+    A fingerprint with a summary stays "hot" for the next interval, i.e. only gets
+    a summary, so an ongoing error storm is one record per interval.
+
+    Everything runs on the listener's thread, so no locking is needed. Records carry
+    a snapshot of their request (see `ErrorQueueHandler.prepare`), but handlers may
+    still query the database from this thread (e.g. a custom reporter), so its
+    connections are closed after each record, same as after a request.
+    """
+
+    def __init__(
+        self, queue, *handlers, respect_handler_level=False, interval: float = 60.0
+    ):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+
+        self.interval = interval
+        self._window_end = time.monotonic() + interval
+        self._counts: dict[str, int] = {}
+        # fingerprint -> last record that wasn't sent
+        self._suppressed: dict[str, logging.LogRecord] = {}
+        self._hot: set[str] = set()
+
+    @classmethod
+    def with_options(cls, **options) -> functools.partial:
+        """
+        For dictConfig, which creates the listener itself, with just the queue &
+        the handlers:
+
+        "listener": {"()": "...ErrorAggregatingQueueListener.with_options", "interval": 60}
+        """
+        return functools.partial(cls, **options)
+
+    def dequeue(self, block):
+        # Wakes up at the end of every interval, errors or not, to send summaries
+        while True:
+            timeout = self._window_end - time.monotonic()
+
+            if timeout > 0:
+                try:
+                    return self.queue.get(block, timeout)
+                except queue.Empty:
+                    pass
+
+            self.flush()
+
+    def handle(self, record):
+        # Set by ErrorQueueHandler.prepare, from the message before it's formatted
+        fingerprint = getattr(record, "error_fingerprint", None)
+
+        if fingerprint is None:
+            fingerprint = record.error_fingerprint = error_fingerprint(record)
+
+        count = self._counts.get(fingerprint, 0) + 1
+        self._counts[fingerprint] = count
+
+        if count == 1 and fingerprint not in self._hot:
+            self._send(record)
+        else:
+            self._suppressed[fingerprint] = record
+
+    def flush(self) -> None:
+        summaries = [
+            self._summarize(record, self._counts[fingerprint])
+            for fingerprint, record in self._suppressed.items()
+        ]
+
+        self._hot = set(self._suppressed)
+        self._counts = {}
+        self._suppressed = {}
+        self._window_end = time.monotonic() + self.interval
+
+        for summary in summaries:
+            self._send(summary)
+
+    def stop(self):
+        super().stop()
+        # Whatever is still counted, e.g. on shutdown
+        self.flush()
+
+    def _send(self, record: logging.LogRecord) -> None:
+        try:
+            super().handle(record)
+        finally:
+            # Not when flushing from another thread, e.g. `stop`, whose connections
+            # aren't ours to close
+            if threading.current_thread() is self._thread:
+                close_old_connections()
+
+    def _summarize(self, record: logging.LogRecord, count: int) -> logging.LogRecord:
+        summary = copy.copy(record)
+        summary.msg = f"{record.getMessage()} [{count}x in the last {self.interval:g}s]"
+        summary.args = None
+        summary.error_count = count
+
+        return summary
+
+
+class ErrorQueueHandler(QueueHandler):
+    """
+    A `QueueHandler` for a thread's queue (the default), that doesn't format the
+    record on the caller's thread & keeps `exc_info`, for handlers like
+    `AdminEmailHandler` that render the traceback themselves.
+
+    The listener is started on first use in each process, so it works with servers
+    that fork after configuring logging (e.g. gunicorn's `preload_app`), and stopped
+    when the handler is closed, e.g. by `logging.shutdown` on exit.
+    """
+
+    # Set by dictConfig, from the handler's "listener" config
+    listener: QueueListener | None = None
+
+    def __init__(self, queue):
+        super().__init__(queue)
+
+        self._pid = None
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        # From the message template, so it has to happen before formatting
+        record.error_fingerprint = error_fingerprint(record)
+        # Arguments may be mutated by the time the listener gets to them
+        record.msg = record.getMessage()
+        record.args = None
+
+        request = getattr(record, "request", None)
+
+        if isinstance(request, HttpRequest):
+            record.request = _request_snapshot(request)
+
+        return record
+
+    def enqueue(self, record):
+        # Called with the handler's lock held
+        if self._pid != os.getpid():
+            self._start_listener()
+
+        super().enqueue(record)
+
+    def close(self):
+        with self.lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+                self._pid = None
+
+        super().close()
+
+    def _start_listener(self) -> None:
+        if self.listener is None:
+            return
+
+        if self._pid is not None:
+            # Forked: the listener's thread (& anything queued for it) is the parent's
+            self.queue = self.listener.queue = queue.Queue()
+            self.listener._thread = None
+
+        self.listener.start()
+        self._pid = os.getpid()
+
+
+def _request_snapshot(request: HttpRequest) -> HttpRequest:
+    """
+    A detached copy of what `AdminEmailHandler`'s report reads from the request,
+    taken on the request's thread. The request itself (its user, session, body
+    stream) is still in use there & must not be touched from the listener's.
+    """
+    snapshot = HttpRequest()
+    snapshot.method = request.method
+    snapshot.path = request.path
+    snapshot.path_info = request.path_info
+    # The plain values only, e.g. not "wsgi.input"
+    snapshot.META = {
+        key: value for key, value in request.META.items() if isinstance(value, str)
+    }
+    snapshot.GET = request.GET.copy()
+    snapshot.COOKIES = dict(request.COOKIES)
+    # Only what was already parsed, the body may be gone by now. No files.
+    post: QueryDict = getattr(request, "_post", None) or QueryDict()
+    snapshot.POST = post.copy()
+    snapshot.sensitive_post_parameters = getattr(  # type: ignore[attr-defined]
+        request, "sensitive_post_parameters", []
+    )
+
+    try:
+        # A string, since the user is a lazy object that may need a query
+        snapshot.user = str(request.user)  # type: ignore[assignment]
+    except Exception:
+        pass
+
+    return snapshot
@@ -0,0 +1,94 @@
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+PROJECT_DIR = Path(__file__).resolve().parents[4]
+
+BOOT_SCRIPT = (
+    "import time; start = time.perf_counter(); import django; django.setup(); "
+    "print(time.perf_counter() - start)"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Boots Django (django.setup()) in fresh interpreters & reports the boot time, "
+        "along with a `python -X importtime` breakdown per package & module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Boots to take the median of."
+        )
+        parser.add_argument(
+            "--top", type=int, default=20, help="Slowest modules to list."
+        )
+
+    def handle(self, *args, runs: int, top: int, **options):
+        boot_times = [float(self._boot().stdout) for _ in range(runs)]
+        imports = self._parse_importtime(self._boot("-X", "importtime").stderr)
+
+        self.stdout.write(
+            f"Boot time (django.setup(), median of {runs}): "
+            f"{statistics.median(boot_times) * 1e3:.1f} ms"
+        )
+        self.stdout.write(
+            f"Imports: {len(imports)} modules, "
+            f"{sum(imports.values()) / 1e3:.1f} ms (with -X importtime overhead)"
+        )
+
+        packages: Counter[str] = Counter()
+
+        for module, self_us in imports.items():
+            packages[module.split(".")[0]] += self_us
+
+        self.stdout.write("\nImport time per top-level package:")
+
+        for package, self_us in packages.most_common(top):
+            self.stdout.write(f"{self_us / 1e3:10.1f} ms  {package}")
+
+        self.stdout.write(f"\nSlowest {top} modules (self time):")
+
+        for module, self_us in imports.most_common(top):
+            self.stdout.write(f"{self_us / 1e3:10.1f} ms  {module}")
+
+    def _boot(self, *python_options: str) -> subprocess.CompletedProcess:
+        result = subprocess.run(
+            [sys.executable, *python_options, "-c", BOOT_SCRIPT],
+            cwd=PROJECT_DIR,
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+        )
+
+        if result.returncode != 0:
+            raise CommandError(f"Django failed to boot:\n{result.stderr}")
+
+        return result
+
+    def _parse_importtime(self, stderr: str) -> Counter[str]:
+        """
+        `-X importtime` lines look like:
+            import time:       self [us] |  cumulative | imported package
+            import time:       466 |     585544 |   django.urls
+        Self times add up without double counting, unlike cumulative ones.
+        """
+        imports: Counter[str] = Counter()
+
+        for line in stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+
+            self_us, _, module = line.removeprefix("import time:").split("|")
+
+            if not self_us.strip().isdigit():
+                continue  # The header
+
+            imports[module.strip()] += int(self_us)
+
+        return imports
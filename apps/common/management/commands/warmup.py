@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from config.warmup import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the warmup (imports the app modules, builds the URL resolvers & model "
+        "metadata, opens database connections & optionally sends requests) & "
+        "reports how long each step took. It only warms its own process, check "
+        "config.warmup for how to warm a server's workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-connect",
+            action="store_false",
+            dest="connect",
+            help="Don't open database connections (e.g. before forking).",
+        )
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            default=[],
+            help="Path to send a synthetic GET to. Can be repeated.",
+        )
+
+    def handle(self, *args, connect: bool, urls: list[str], **options):
+        report = warmup(connect=connect, urls=urls)
+
+        for step, seconds in report["timings"].items():
+            self.stdout.write(f"{step:>12}: {seconds * 1e3:8.1f} ms")
+
+        self.stdout.write(
+            f"Imported {report['modules']} modules, primed {report['models']} models, "
+            f"connected {', '.join(report['connections']) or 'nothing'}."
+        )
+
+        for url, status in report["requests"].items():
+            self.stdout.write(f"GET {url} -> {status}")
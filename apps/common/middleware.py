@@ -0,0 +1,231 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from apps.common.enums import QueryBudgetAction
+from apps.common.exceptions import QueryBudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(max_queries: int):
+    """
+    Declares the most queries a view is expected to run per request. Works on
+    function views & on view classes (DRF included):
+
+    @query_budget(3)
+    class UserListApi(generics.ListAPIView):
+        ...
+
+    See config.settings.query_metrics for what happens when it is exceeded.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+class QueryMetrics:
+    """
+    Runs around each query of a request (see `record_query`). Kept to a couple of
+    attribute updates, to stay in the low microseconds per query (see
+    benchmarks/bench_query_metrics.py).
+    """
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self) -> int:
+        return self.count - len(self.statements)
+
+    def most_duplicated(self) -> tuple[str, int] | None:
+        if not self.duplicates:
+            return None
+
+        return self.statements.most_common(1)[0]
+
+
+_request_metrics: ContextVar[QueryMetrics | None] = ContextVar(
+    "request_query_metrics", default=None
+)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    An `execute_wrapper` that apps.common.db installs on every connection, once,
+    which hands the query to the metrics of the current request.
+
+    The metrics are looked up in a context variable, instead of the middleware
+    wrapping the connections per request, because connections are per thread: under
+    ASGI the queries run in the `sync_to_async` thread, not on the event loop where
+    the middleware runs. The variable follows the request into that thread.
+    """
+    metrics = _request_metrics.get()
+
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    return metrics(execute, sql, params, many, context)
+
+
+class QueryMetricsMiddleware:
+    """
+    Counts the queries, the time spent in the database & the duplicate queries of
+    every request, on all database aliases. Configured in
+    config.settings.query_metrics.
+
+    It should come first in MIDDLEWARE, so that queries made by other middleware
+    (e.g. sessions & auth) are counted as well.
+
+    Both sync & async capable, so async views under ASGI don't get adapted to sync
+    (& back) on its account.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        if not settings.QUERY_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = QueryMetrics()
+        start = time.perf_counter()
+        token = _request_metrics.set(metrics)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+
+        return self._finish(request, response, metrics, start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        metrics = QueryMetrics()
+        start = time.perf_counter()
+        token = _request_metrics.set(metrics)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_metrics.reset(token)
+
+        return self._finish(request, response, metrics, start)
+
+    def _finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: QueryMetrics,
+        start: float,
+    ) -> HttpResponse:
+        duration = time.perf_counter() - start
+
+        if settings.QUERY_METRICS_SERVER_TIMING:
+            response.headers["Server-Timing"] = self._server_timing(metrics, duration)
+
+        view_name = self._view_name(request)
+        self._log(request, response, metrics, duration, view_name)
+        self._check_budget(request, metrics, view_name)
+
+        return response
+
+    def _server_timing(self, metrics: QueryMetrics, duration: float) -> str:
+        return (
+            f'db;dur={metrics.duration * 1000:.1f};desc="{metrics.count} queries, '
+            f'{metrics.duplicates} duplicate", total;dur={duration * 1000:.1f}'
+        )
+
+    def _log(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: QueryMetrics,
+        duration: float,
+        view_name: str,
+    ) -> None:
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "view": view_name,
+            "status": response.status_code,
+            "queries": metrics.count,
+            "duplicates": metrics.duplicates,
+            "db_ms": round(metrics.duration * 1000, 1),
+            "total_ms": round(duration * 1000, 1),
+        }
+
+        logger.info(
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra={"query_metrics": fields},
+        )
+
+    def _check_budget(
+        self, request: HttpRequest, metrics: QueryMetrics, view_name: str
+    ) -> None:
+        budget = self._view_budget(request)
+
+        if budget is None or metrics.count <= budget:
+            return
+
+        message = f"{view_name} ran {metrics.count} queries, its budget is {budget}."
+        most_duplicated = metrics.most_duplicated()
+
+        if most_duplicated is not None:
+            sql, count = most_duplicated
+            message += f" Most duplicated ({count}x): {sql}"
+
+        if settings.QUERY_BUDGET_ACTION == QueryBudgetAction.RAISE:
+            raise QueryBudgetExceeded(message)
+
+        logger.warning(message)
+
+    def _view_budget(self, request: HttpRequest) -> int | None:
+        match = request.resolver_match
+
+        if match is not None:
+            view = getattr(match.func, "view_class", match.func)
+            budget = getattr(view, "query_budget", None)
+
+            if budget is not None:
+                return budget
+
+        return settings.QUERY_BUDGET_DEFAULT
+
+    def _view_name(self, request: HttpRequest) -> str:
+        match = request.resolver_match
+
+        return match.view_name if match is not None else ""
@@ -1,14 +1,22 @@
-from collections.abc import Iterable
-from typing import TYPE_CHECKING, Any
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Literal
 
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import models, transaction
 from django.utils import timezone
 
+from apps.common.signals import post_bulk_update
+from apps.common.utils import ModelFieldMeta, get_model_field_meta
+
 if TYPE_CHECKING:
     from apps.common.models import BaseModel
 
 # from .types import DjangoModelType
 
+type ValidationMode = Literal["full", "changed", "none"]
+
 
 def model_update[T: BaseModel](
     *,
@@ -16,6 +24,7 @@ def model_update[T: BaseModel](
     fields: Iterable[str],
     data: dict[str, Any],
     auto_updated_at: bool = True,
+    validate: ValidationMode = "full",
 ) -> tuple[T, bool]:
     """
     Generic update service meant to be reused in local update services.
@@ -41,12 +50,183 @@ def model_update[T: BaseModel](
         - There's a strict assertion that all values in `fields` are actual fields in `instance`.
         - `fields` can support m2m fields, which are handled after the update on `instance`.
         - If `auto_updated_at` is True, we'll try bumping `updated_at` with the current timestamp.
+        - `validate` controls the `full_clean` call before saving:
+            - "full" cleans every field & runs all unique checks (default).
+            - "changed" cleans only the updated fields & skips unique checks on the rest.
+            - "none" skips validation entirely, use it only for already validated data.
     """
-    has_updated = False
-    m2m_data: dict[str, Any] = {}
-    update_fields: list[str] = []
+    field_meta = get_model_field_meta(type(instance))
+    update_fields, m2m_data = _model_apply_changes(
+        instance=instance, fields=fields, data=data, field_meta=field_meta
+    )
+    has_updated = bool(update_fields)
+
+    # Perform an update only if any of the fields were actually changed
+    if has_updated:
+        if auto_updated_at:
+            _model_touch_updated_at(
+                instance=instance,
+                field_meta=field_meta,
+                update_fields=update_fields,
+                now=timezone.now(),
+            )
+
+        _model_validate(
+            instance=instance,
+            field_meta=field_meta,
+            update_fields=update_fields,
+            validate=validate,
+        )
+        # Update only the fields that are meant to be updated.
+        # Django docs reference:
+        # https://docs.djangoproject.com/en/dev/ref/models/instances/#specifying-which-fields-to-save
+        instance.save(update_fields=update_fields)
+
+    for field_name, value in m2m_data.items():
+        related_manager = getattr(instance, field_name)
+        related_manager.set(value)
+
+        # Still not sure about this.
+        # What if we only update m2m relations & nothing on the model? Is this still considered as updated?
+        has_updated = True
+
+    return instance, has_updated
+
+
+def model_bulk_update[T: BaseModel](
+    *,
+    instances: Sequence[T],
+    fields: Iterable[str],
+    data_per_instance: Sequence[dict[str, Any]],
+    auto_updated_at: bool = True,
+    validate: ValidationMode = "full",
+    batch_size: int | None = 1000,
+) -> tuple[Sequence[T], list[bool]]:
+    """
+    Bulk counterpart of `model_update`, meant for updating many instances of the same
+    model at once (e.g. admin imports).
+
+    For example:
+
+    def user_bulk_deactivate(*, users: list[User]) -> list[User]:
+        data = [{"is_active": False} for _ in users]
+        users, updated = model_bulk_update(
+            instances=users, fields=["is_active"], data_per_instance=data
+        )
 
-    model_fields = {field.name: field for field in instance._meta.get_fields()}
+        return users
+
+    Return:
+        Tuple with the following elements:
+        1. The instances we updated, in the order they were given.
+        2. A list of booleans, one per instance, representing whether we performed an
+           update on it or not.
+
+    Some important notes:
+        - `data_per_instance[i]` holds the data for `instances[i]`.
+        - Each instance is diffed & validated the same way as in `model_update`.
+          Validation still runs per instance, so validate="full" issues one unique
+          check SELECT per instance (per unique field) before the bulk writes. Use
+          "changed" or "none" to avoid them.
+        - Instances are grouped by the set of fields that actually changed, and each
+          group is written with `bulk_update`, in batches of `batch_size`.
+        - m2m fields are handled after the updates, in a single delete & insert on the
+          through table per field. m2m signals are not sent for auto-created through
+          tables, custom ones fall back to `.set()`.
+        - `bulk_update` does not call `save()`, so no `pre_save`/`post_save` signals.
+          `apps.common.signals.post_bulk_update` is sent instead, with the updated
+          instances.
+    """
+    assert len(instances) == len(
+        data_per_instance
+    ), "instances and data_per_instance must have the same length."
+
+    updated_flags = [False] * len(instances)
+
+    if not instances:
+        return instances, updated_flags
+
+    fields = list(fields)
+    model = type(instances[0])
+    field_meta = get_model_field_meta(model)
+    model_fields = field_meta.fields
+
+    for field in fields:
+        assert (
+            model_fields.get(field) is not None
+        ), f"{field} is not part of {model.__name__} fields."
+
+    now = timezone.now()
+    # changed field names -> instances with exactly those changes
+    groups: dict[frozenset[str], list[T]] = defaultdict(list)
+    # m2m field name -> [(instance, value), ...]
+    m2m_data: dict[str, list[tuple[T, Any]]] = defaultdict(list)
+
+    for index, (instance, data) in enumerate(zip(instances, data_per_instance)):
+        update_fields, instance_m2m_data = _model_apply_changes(
+            instance=instance, fields=fields, data=data, field_meta=field_meta
+        )
+
+        for field_name, value in instance_m2m_data.items():
+            m2m_data[field_name].append((instance, value))
+            updated_flags[index] = True
+
+        if not update_fields:
+            continue
+
+        updated_flags[index] = True
+
+        if auto_updated_at:
+            _model_touch_updated_at(
+                instance=instance,
+                field_meta=field_meta,
+                update_fields=update_fields,
+                now=now,
+            )
+
+        _model_validate(
+            instance=instance,
+            field_meta=field_meta,
+            update_fields=update_fields,
+            validate=validate,
+        )
+        groups[frozenset(update_fields)].append(instance)
+
+    with transaction.atomic():
+        for update_fields_set, group in groups.items():
+            model._default_manager.bulk_update(
+                group, sorted(update_fields_set), batch_size=batch_size
+            )
+
+        for field_name, pairs in m2m_data.items():
+            _m2m_bulk_set(
+                field=model_fields[field_name], pairs=pairs, batch_size=batch_size
+            )
+
+    updated_instances = [
+        instance for instance, updated in zip(instances, updated_flags) if updated
+    ]
+
+    if updated_instances:
+        post_bulk_update.send(sender=model, instances=updated_instances)
+
+    return instances, updated_flags
+
+
+def _model_apply_changes(
+    *,
+    instance: models.Model,
+    fields: Iterable[str],
+    data: dict[str, Any],
+    field_meta: ModelFieldMeta,
+) -> tuple[list[str], dict[str, Any]]:
+    """
+    The diffing shared by the update services. Sets the changed values of `fields`
+    on `instance` & returns the names of the changed fields, along with the m2m
+    values, which can only be set after the instance is saved.
+    """
+    update_fields: list[str] = []
+    m2m_data: dict[str, Any] = {}
 
     for field in fields:
         # Skip if a field is not present in the actual data
@@ -54,44 +234,204 @@ def model_update[T: BaseModel](
             continue
 
         # If field is not an actual model field, raise an error
-        model_field = model_fields.get(field)
-
         assert (
-            model_field is not None
+            field in field_meta.fields
         ), f"{field} is not part of {instance.__class__.__name__} fields."
 
         # If we have m2m field, handle differently
-        if isinstance(model_field, models.ManyToManyField):
+        if field in field_meta.m2m_fields:
             m2m_data[field] = data[field]
             continue
 
         if getattr(instance, field) != data[field]:
-            has_updated = True
             update_fields.append(field)
             setattr(instance, field, data[field])
 
-    # Perform an update only if any of the fields were actually changed
+    return update_fields, m2m_data
+
+
+def _model_touch_updated_at(
+    *,
+    instance: models.Model,
+    field_meta: ModelFieldMeta,
+    update_fields: list[str],
+    now: datetime,
+) -> None:
+    # We want to take care of the `updated_at` field,
+    # Only if the models has that field
+    # And if no value for updated_at has been provided
+    if field_meta.has_updated_at and "updated_at" not in update_fields:
+        update_fields.append("updated_at")
+        setattr(instance, "updated_at", now)
+
+
+def _m2m_bulk_set(
+    *,
+    field: models.ManyToManyField,
+    pairs: Sequence[tuple[models.Model, Any]],
+    batch_size: int | None,
+) -> None:
+    through = field.remote_field.through
+    assert through is not None, f"{field.name} has no through model."
+
+    if not through._meta.auto_created:
+        for instance, value in pairs:
+            getattr(instance, field.name).set(value)
+        return
+
+    source_name = f"{field.m2m_field_name()}_id"
+    target_name = f"{field.m2m_reverse_field_name()}_id"
+
+    pks = [instance.pk for instance, _ in pairs]
+    step = batch_size or len(pks)
+
+    for start in range(0, len(pks), step):
+        through._default_manager.filter(
+            **{f"{source_name}__in": pks[start : start + step]}
+        ).delete()
+
+    rows = [
+        through(
+            **{
+                source_name: instance.pk,
+                target_name: obj.pk if isinstance(obj, models.Model) else obj,
+            }
+        )
+        for instance, value in pairs
+        for obj in dict.fromkeys(value)
+    ]
+
+    through._default_manager.bulk_create(rows, batch_size=batch_size)
+
+
+def _model_validate(
+    *,
+    instance: models.Model,
+    field_meta: ModelFieldMeta,
+    update_fields: Iterable[str],
+    validate: ValidationMode,
+) -> None:
+    if validate == "none":
+        return
+
+    if validate == "full":
+        instance.full_clean()
+        return
+
+    # Excluded fields are neither cleaned nor unique/constraint checked,
+    # so unchanged unique columns don't cost an extra SELECT.
+    instance.full_clean(exclude=field_meta.concrete_fields.difference(update_fields))
+
+
+async def amodel_update[T: BaseModel](
+    *,
+    instance: T,
+    fields: Iterable[str],
+    data: dict[str, Any],
+    auto_updated_at: bool = True,
+    validate: ValidationMode = "full",
+) -> tuple[T, bool]:
+    """
+    Async counterpart of `model_update`, with the same arguments & return value.
+
+    Built on the async ORM (`asave`, `aset`), so it doesn't need a `sync_to_async`
+    thread hop. The only exception are unique checks, which Django can only run
+    synchronously. They are hopped to a thread, but only when there is something
+    to check, e.g. not for validate="changed" without changed unique fields.
+    """
+    field_meta = get_model_field_meta(type(instance))
+    update_fields, m2m_data = _model_apply_changes(
+        instance=instance, fields=fields, data=data, field_meta=field_meta
+    )
+    has_updated = bool(update_fields)
+
     if has_updated:
         if auto_updated_at:
-            # We want to take care of the `updated_at` field,
-            # Only if the models has that field
-            # And if no value for updated_at has been provided
-            if "updated_at" in model_fields and "updated_at" not in update_fields:
-                update_fields.append("updated_at")
-                instance.updated_at = timezone.now()
+            _model_touch_updated_at(
+                instance=instance,
+                field_meta=field_meta,
+                update_fields=update_fields,
+                now=timezone.now(),
+            )
 
-        instance.full_clean()
-        # Update only the fields that are meant to be updated.
-        # Django docs reference:
-        # https://docs.djangoproject.com/en/dev/ref/models/instances/#specifying-which-fields-to-save
-        instance.save(update_fields=update_fields)
+        await _amodel_validate(
+            instance=instance,
+            field_meta=field_meta,
+            update_fields=update_fields,
+            validate=validate,
+        )
+        await instance.asave(update_fields=update_fields)
 
     for field_name, value in m2m_data.items():
         related_manager = getattr(instance, field_name)
-        related_manager.set(value)
+        await related_manager.aset(value)
 
-        # Still not sure about this.
-        # What if we only update m2m relations & nothing on the model? Is this still considered as updated?
         has_updated = True
 
     return instance, has_updated
+
+
+async def _amodel_validate(
+    *,
+    instance: models.Model,
+    field_meta: ModelFieldMeta,
+    update_fields: Iterable[str],
+    validate: ValidationMode,
+) -> None:
+    if validate == "none":
+        return
+
+    exclude = (
+        None
+        if validate == "full"
+        else field_meta.concrete_fields.difference(update_fields)
+    )
+
+    # Cleaning fields & the model itself doesn't touch the database
+    instance.full_clean(
+        exclude=exclude, validate_unique=False, validate_constraints=False
+    )
+
+    if _model_needs_db_validation(
+        instance=instance, field_meta=field_meta, exclude=exclude
+    ):
+        await sync_to_async(instance.validate_unique)(exclude=exclude)
+        await sync_to_async(instance.validate_constraints)(exclude=exclude)
+
+
+def _model_needs_db_validation(
+    *,
+    instance: models.Model,
+    field_meta: ModelFieldMeta,
+    exclude: Iterable[str] | None,
+) -> bool:
+    """
+    Whether `validate_unique`/`validate_constraints` would query the database, i.e.
+    if there are constraints, unique_together sets or unique (for date) fields that
+    aren't excluded. The pk is only checked for new rows.
+    """
+    exclude = set(exclude or ())
+    opts = instance._meta
+
+    for model in [type(instance), *opts.get_parent_list()]:
+        if model._meta.constraints:
+            return True
+
+        if any(
+            not exclude.intersection(names) for names in model._meta.unique_together
+        ):
+            return True
+
+    for name in field_meta.concrete_fields.difference(exclude):
+        field = field_meta.fields[name]
+
+        if field.primary_key and not instance._state.adding:
+            continue
+
+        if field.unique or any(
+            getattr(field, f"unique_for_{part}", None)
+            for part in ("date", "month", "year")
+        ):
+            return True
+
+    return False
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent by apps.common.services.model_bulk_update, since bulk_update skips save() and
+# therefore post_save. Arguments: sender (the model class), instances.
+post_bulk_update = Signal()
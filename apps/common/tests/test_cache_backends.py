@@ -0,0 +1,119 @@
+import multiprocessing
+
+import pytest
+
+from apps.common.cache_backends import SharedFileCache
+from config.settings.caches import CacheBackend, _cache_config
+
+
+@pytest.fixture
+def shared_cache(tmp_path) -> SharedFileCache:
+    return SharedFileCache(str(tmp_path / "cache.db"), {"OPTIONS": {"MAX_ENTRIES": 10}})
+
+
+def test_shared_file_cache_basic_operations(shared_cache: SharedFileCache):
+    assert shared_cache.get("missing", "default") == "default"
+
+    shared_cache.set("key", {"a": 1})
+    assert shared_cache.get("key") == {"a": 1}
+    assert shared_cache.has_key("key")
+
+    assert not shared_cache.add("key", "other")
+    assert shared_cache.add("new", "value")
+
+    shared_cache.set("counter", 1)
+    assert shared_cache.incr("counter") == 2
+
+    assert shared_cache.delete("key")
+    assert not shared_cache.has_key("key")
+
+    shared_cache.clear()
+    assert shared_cache.get("new") is None
+
+
+def test_shared_file_cache_expires_entries(shared_cache: SharedFileCache):
+    shared_cache.set("key", "value", timeout=-1)
+
+    assert shared_cache.get("key") is None
+    assert shared_cache.add("key", "fresh")
+    assert shared_cache.touch("key", timeout=None)
+    assert shared_cache.get("key") == "fresh"
+
+
+def test_shared_file_cache_culls_least_recently_used(shared_cache: SharedFileCache):
+    for i in range(10):
+        shared_cache.set(f"key_{i}", i)
+
+    # Make key_0 the most recently used one
+    shared_cache._connection.execute("UPDATE cache SET accessed = 0")
+    shared_cache._connection.execute(
+        "UPDATE cache SET accessed = 1 WHERE key = ?",
+        (shared_cache.make_key("key_0"),),
+    )
+    shared_cache.set("key_10", 10)
+    shared_cache._cull()
+
+    # 11 entries, over MAX_ENTRIES -> the 11 // 3 least recently used are dropped
+    (count,) = shared_cache._connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+    assert count == 8
+    assert shared_cache.get("key_0") == 0
+    assert shared_cache.get("key_10") == 10
+
+
+def test_shared_file_cache_reads_dont_write(shared_cache: SharedFileCache, monkeypatch):
+    monkeypatch.setattr(SharedFileCache, "ACCESS_RESOLUTION", 0)
+    shared_cache.set("key", "value")
+    shared_cache.set("expired", "value", timeout=-1)
+    conn = shared_cache._connection
+    changes = conn.total_changes
+
+    assert shared_cache.get("key") == "value"
+    assert shared_cache.get("expired") is None
+    assert conn.total_changes == changes
+
+    # The access time goes out with the next write
+    (accessed,) = conn.execute(
+        "SELECT accessed FROM cache WHERE key = ?", (shared_cache.make_key("key"),)
+    ).fetchone()
+    shared_cache.set("other", "value")
+    (bumped,) = conn.execute(
+        "SELECT accessed FROM cache WHERE key = ?", (shared_cache.make_key("key"),)
+    ).fetchone()
+    assert bumped > accessed
+
+
+def _set_in_child(location: str) -> None:
+    SharedFileCache(location, {}).set("from_child", "hello")
+
+
+def test_shared_file_cache_is_shared_between_processes(tmp_path):
+    location = str(tmp_path / "cache.db")
+    cache = SharedFileCache(location, {})
+    cache.set("warm", True)
+
+    process = multiprocessing.get_context("fork").Process(
+        target=_set_in_child, args=(location,)
+    )
+    process.start()
+    process.join()
+
+    assert cache.get("from_child") == "hello"
+
+
+@pytest.mark.parametrize(
+    "backend, culls",
+    [
+        (CacheBackend.LOCMEM, True),
+        (CacheBackend.SHARED, True),
+        (CacheBackend.FILE, True),
+        (CacheBackend.REDIS, False),
+        (CacheBackend.MEMCACHED, False),
+    ],
+)
+def test_cache_config_only_sets_culling_options_where_supported(
+    backend: CacheBackend, culls: bool
+):
+    config = _cache_config(backend)
+
+    # Redis & memcached pass OPTIONS to their clients as kwargs
+    assert ("OPTIONS" in config) is culls
@@ -0,0 +1,27 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+def test_startup_profile_reports_boot_time_and_imports():
+    out = StringIO()
+
+    call_command("startup_profile", "--runs", "1", "--top", "3", stdout=out)
+
+    report = out.getvalue()
+    assert "Boot time (django.setup(), median of 1):" in report
+    assert "ms  django\n" in report
+    assert "Slowest 3 modules (self time):" in report
+
+
+@pytest.mark.django_db
+def test_warmup_reports_steps():
+    out = StringIO()
+
+    call_command("warmup", "--url", "/api/users/", stdout=out)
+
+    report = out.getvalue()
+    assert "imports:" in report
+    assert "connections:" in report
+    assert "GET /api/users/ -> 403" in report
@@ -0,0 +1,73 @@
+import pytest
+from django.db import transaction
+
+from apps.common.utils import get_object
+from apps.users.models import BaseUser
+from apps.users.services import user_create, user_list
+from config.database_router import replica_db_for_read, replica_reads
+
+# Both test databases are real & separate, so a row created only on the replica
+# tells us where a read went. Reads within a transaction never go to the replica,
+# so the tests can't be wrapped in one.
+pytestmark = pytest.mark.django_db(databases=["default", "replica"], transaction=True)
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICA_READS = True
+    settings.DATABASE_REPLICA_STICKY_SECONDS = 0
+
+
+@pytest.fixture
+def replica_user() -> BaseUser:
+    return BaseUser.objects.db_manager("replica").create_user(
+        email="replica@example.com"
+    )
+
+
+def test_marked_reads_go_to_the_replica(replica, replica_user: BaseUser):
+    with replica_reads():
+        assert BaseUser.objects.filter(pk=replica_user.pk).exists()
+
+    assert not BaseUser.objects.filter(pk=replica_user.pk).exists()
+
+
+def test_reads_stay_on_the_primary_when_replica_reads_are_off(
+    replica_user: BaseUser,
+):
+    with replica_reads():
+        assert not BaseUser.objects.filter(pk=replica_user.pk).exists()
+
+
+def test_user_list_and_get_object_read_from_the_replica(
+    replica, replica_user: BaseUser
+):
+    assert list(user_list()) == [replica_user]
+    assert get_object(BaseUser, pk=replica_user.pk) == replica_user
+
+
+def test_writes_go_to_the_primary(replica, replica_user: BaseUser):
+    user = get_object(BaseUser, pk=replica_user.pk)
+    user.is_admin = True
+    user.save()
+
+    assert BaseUser.objects.using("default").filter(pk=user.pk).exists()
+    assert not BaseUser.objects.using("replica").get(pk=user.pk).is_admin
+
+
+def test_reads_stick_to_the_primary_after_a_write(
+    replica, settings, replica_user: BaseUser
+):
+    settings.DATABASE_REPLICA_STICKY_SECONDS = 60
+    user = user_create(email="primary@example.com")
+
+    assert replica_db_for_read() == "default"
+    assert list(user_list()) == [user]
+
+
+def test_reads_within_a_transaction_stay_on_the_primary(
+    replica, replica_user: BaseUser
+):
+    with transaction.atomic():
+        assert replica_db_for_read() == "default"
+        assert get_object(BaseUser, pk=replica_user.pk) is None
@@ -0,0 +1,21 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+def test_sqlite_connections_are_tuned(settings):
+    with connection.cursor() as cursor:
+        pragmas = {
+            name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("synchronous", "busy_timeout", "temp_store", "cache_size")
+        }
+
+    # synchronous: 1 = NORMAL, temp_store: 2 = MEMORY
+    assert pragmas == {
+        "synchronous": 1,
+        "busy_timeout": settings.DATABASE_SQLITE_PRAGMAS["busy_timeout"],
+        "temp_store": 2,
+        "cache_size": settings.DATABASE_SQLITE_PRAGMAS["cache_size"],
+    }
+    # Opt-in, see config.settings.database
+    assert connection.transaction_mode is None
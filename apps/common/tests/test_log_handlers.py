@@ -0,0 +1,209 @@
+import logging
+import queue
+import threading
+
+import pytest
+from django.core import mail
+from django.views.debug import ExceptionReporter
+
+from apps.common.log_handlers import (
+    ErrorAggregatingQueueListener,
+    ErrorQueueHandler,
+    error_fingerprint,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+
+        self.records: list[logging.LogRecord] = []
+        self.threads: list[int] = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.get_ident())
+
+
+def _error_record(message: str, exc: Exception | None = None) -> logging.LogRecord:
+    def fail():
+        raise exc
+
+    try:
+        fail()
+    except Exception as e:
+        exc_info = (type(e), e, e.__traceback__)
+
+    return logging.LogRecord(
+        "test", logging.ERROR, __file__, 1, message, None, exc_info if exc else None
+    )
+
+
+def test_error_fingerprint_groups_by_type_and_location():
+    first = _error_record("First", ValueError("a"))
+    second = _error_record("Second", ValueError("b"))
+    other_type = _error_record("First", KeyError("a"))
+
+    assert error_fingerprint(first) == error_fingerprint(second)
+    assert error_fingerprint(first) != error_fingerprint(other_type)
+    assert error_fingerprint(first).startswith(f"builtins.ValueError@{__file__}:")
+
+
+def test_error_fingerprint_uses_the_message_template_without_an_exception():
+    first = logging.LogRecord(
+        "test", logging.ERROR, "x.py", 1, "Failed: %s", ("a",), None
+    )
+    second = logging.LogRecord(
+        "test", logging.ERROR, "x.py", 1, "Failed: %s", ("b",), None
+    )
+
+    assert error_fingerprint(first) == error_fingerprint(second)
+
+
+def test_listener_sends_the_first_error_and_summarizes_the_rest():
+    target = ListHandler()
+    listener = ErrorAggregatingQueueListener(queue.Queue(), target, interval=60)
+
+    for message in ["First", "Second", "Third"]:
+        listener.handle(_error_record(message, ValueError(message)))
+
+    listener.handle(_error_record("Other", KeyError()))
+
+    assert [record.getMessage() for record in target.records] == ["First", "Other"]
+
+    listener.flush()
+
+    assert target.records[-1].getMessage() == "Third [3x in the last 60s]"
+    assert target.records[-1].exc_info is not None
+    assert len(target.records) == 3
+
+
+def test_listener_only_summarizes_ongoing_errors():
+    target = ListHandler()
+    listener = ErrorAggregatingQueueListener(queue.Queue(), target, interval=60)
+
+    for _ in range(2):
+        listener.handle(_error_record("Storm", ValueError()))
+
+    listener.flush()
+    target.records.clear()
+
+    # Still going: nothing right away, one summary per interval
+    for _ in range(5):
+        listener.handle(_error_record("Storm", ValueError()))
+
+    assert target.records == []
+
+    listener.flush()
+
+    assert [record.getMessage() for record in target.records] == [
+        "Storm [5x in the last 60s]"
+    ]
+
+    # A quiet interval resets it
+    listener.flush()
+    listener.flush()
+    target.records.clear()
+    listener.handle(_error_record("Storm", ValueError()))
+
+    assert [record.getMessage() for record in target.records] == ["Storm"]
+
+
+def test_queue_handler_sends_from_the_listener_thread():
+    target = ListHandler()
+    handler = ErrorQueueHandler(queue.Queue())
+    handler.listener = ErrorAggregatingQueueListener(handler.queue, target)
+    logger = logging.getLogger("test_queue_handler")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    try:
+        try:
+            raise ValueError("Broken")
+        except ValueError:
+            for user in ["a", "b"]:
+                logger.exception("Failed for %s", user)
+    finally:
+        logger.removeHandler(handler)
+        # Stops the listener, after everything queued is handled
+        handler.close()
+
+    assert [record.getMessage() for record in target.records] == [
+        "Failed for a",
+        "Failed for b [2x in the last 60s]",
+    ]
+    assert target.records[0].exc_info[0] is ValueError
+    # The summary is sent by `close`, on our thread
+    assert target.threads[0] != threading.get_ident()
+
+
+def test_queue_handler_fingerprints_messages_before_formatting_them():
+    target = ListHandler()
+    handler = ErrorQueueHandler(queue.Queue())
+    handler.listener = ErrorAggregatingQueueListener(handler.queue, target)
+    logger = logging.getLogger("test_queue_handler_fingerprints")
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    try:
+        for user in range(3):
+            logger.error("Failed for user %s", user)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    assert len({record.error_fingerprint for record in target.records}) == 1
+    assert [record.getMessage() for record in target.records] == [
+        "Failed for user 0",
+        "Failed for user 2 [3x in the last 60s]",
+    ]
+
+
+def test_queue_handler_sends_a_snapshot_of_the_request(rf):
+    target = ListHandler()
+    handler = ErrorQueueHandler(queue.Queue())
+    handler.listener = ErrorAggregatingQueueListener(handler.queue, target)
+    logger = logging.getLogger("test_queue_handler_request")
+    logger.addHandler(handler)
+    logger.propagate = False
+    request = rf.post("/users/?page=2", {"email": "user@example.com"})
+    request.POST  # noqa: B018
+
+    try:
+        logger.error("Internal Server Error", extra={"request": request})
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    (record,) = target.records
+    assert record.request is not request
+    assert "wsgi.input" not in record.request.META
+    assert record.request.POST["email"] == "user@example.com"
+
+    report = ExceptionReporter(record.request, None, None, None).get_traceback_text()
+    assert "/users/?page=2" in report
+    assert "user@example.com" in report
+
+
+@pytest.mark.django_db
+def test_django_errors_are_aggregated_into_admin_emails(settings):
+    settings.ADMINS = [("Admin", "admin@example.com")]
+    handler = next(
+        handler
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, ErrorQueueHandler)
+    )
+
+    assert logging.getLogger("django").handlers == []
+
+    for _ in range(3):
+        try:
+            raise ValueError("Broken")
+        except ValueError:
+            logging.getLogger("django.request").exception("Internal Server Error")
+
+    # Sends what's queued & counted. The listener restarts on the next error.
+    handler.close()
+
+    assert len(mail.outbox) == 2
+    assert "[3x in the last" in mail.outbox[1].subject
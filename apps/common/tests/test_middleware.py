@@ -0,0 +1,121 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.urls import ResolverMatch, reverse
+
+from apps.common.enums import QueryBudgetAction
+from apps.common.exceptions import QueryBudgetExceeded
+from apps.common.middleware import QueryMetricsMiddleware, query_budget
+from apps.users.models import BaseUser
+from apps.users.services import user_create
+
+
+def n_plus_one_view(request):
+    for pk in range(3):
+        BaseUser.objects.filter(pk=pk).exists()
+
+    return HttpResponse()
+
+
+@pytest.fixture
+def metrics_log(caplog):
+    # The logger doesn't propagate to root, where caplog listens
+    logger = logging.getLogger("apps.common.middleware")
+    logger.addHandler(caplog.handler)
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        yield caplog
+
+    logger.removeHandler(caplog.handler)
+
+
+def _request(rf, view):
+    request = rf.get("/users/")
+    request.resolver_match = ResolverMatch(view, (), {}, url_name="users")
+
+    return request
+
+
+@pytest.mark.django_db
+def test_query_metrics_are_sent_as_server_timing_and_logged(rf, metrics_log):
+    middleware = QueryMetricsMiddleware(n_plus_one_view)
+    response = middleware(_request(rf, n_plus_one_view))
+
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert '"3 queries, 2 duplicate"' in response.headers["Server-Timing"]
+
+    (record,) = metrics_log.records
+    assert record.query_metrics["queries"] == 3
+    assert record.query_metrics["duplicates"] == 2
+    assert "view=users" in record.getMessage()
+
+
+@pytest.mark.django_db
+def test_query_budget_raises_or_warns_when_exceeded(rf, settings, metrics_log):
+    view = query_budget(2)(lambda request: n_plus_one_view(request))
+    middleware = QueryMetricsMiddleware(view)
+
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 queries, its budget is 2"):
+        middleware(_request(rf, view))
+
+    settings.QUERY_BUDGET_ACTION = QueryBudgetAction.WARN
+
+    assert middleware(_request(rf, view)).status_code == 200
+
+    warning = metrics_log.records[-1]
+    assert warning.levelno == logging.WARNING
+    assert "Most duplicated (3x)" in warning.getMessage()
+
+
+@pytest.mark.django_db
+def test_query_budget_default_applies_to_views_without_one(rf, settings):
+    settings.QUERY_BUDGET_DEFAULT = 5
+    middleware = QueryMetricsMiddleware(n_plus_one_view)
+
+    assert middleware(_request(rf, n_plus_one_view)).status_code == 200
+
+    settings.QUERY_BUDGET_DEFAULT = 1
+
+    with pytest.raises(QueryBudgetExceeded):
+        middleware(_request(rf, n_plus_one_view))
+
+
+def test_query_metrics_middleware_is_not_adapted_under_asgi(monkeypatch):
+    handlers = []
+    adapt_method_mode = BaseHandler.adapt_method_mode
+
+    def spy(self, is_async, method, *args, **kwargs):
+        result = adapt_method_mode(self, is_async, method, *args, **kwargs)
+        # Middleware instances come wrapped in convert_exception_to_response
+        handlers.append((getattr(method, "__wrapped__", method), result is not method))
+
+        return result
+
+    monkeypatch.setattr(BaseHandler, "adapt_method_mode", spy)
+
+    ASGIHandler()
+
+    (adapted,) = [
+        adapted
+        for handler, adapted in handlers
+        if isinstance(handler, QueryMetricsMiddleware)
+    ]
+    assert not adapted
+
+
+@pytest.mark.django_db
+def test_query_metrics_count_the_queries_of_async_views():
+    admin = user_create(email="admin@example.com", is_admin=True)
+    client = AsyncClient()
+    client.force_login(admin)
+
+    response = async_to_sync(client.get)(reverse("api:users:list-async"))
+
+    assert response.status_code == 200
+    # Session, request user & the page, run in the `sync_to_async` thread
+    assert '"3 queries, 0 duplicate"' in response.headers["Server-Timing"]
@@ -0,0 +1,117 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+
+from apps.common.services import model_bulk_update, model_update
+from apps.users.models import BaseUser
+from apps.users.services import user_create
+
+
+@pytest.fixture
+def users(db) -> list[BaseUser]:
+    return [user_create(email=f"user_{i}@example.com") for i in range(3)]
+
+
+def test_model_bulk_update_returns_per_instance_flags(users: list[BaseUser]):
+    data = [{"is_admin": True}, {"is_admin": False}, {"is_active": False}]
+
+    _, updated = model_bulk_update(
+        instances=users, fields=["is_admin", "is_active"], data_per_instance=data
+    )
+
+    assert updated == [True, False, True]
+    assert list(BaseUser.objects.filter(is_admin=True)) == [users[0]]
+    assert list(BaseUser.objects.filter(is_active=False)) == [users[2]]
+
+
+def test_model_bulk_update_bumps_updated_at_only_on_changed(users: list[BaseUser]):
+    before = [user.updated_at for user in users]
+    data = [{"is_admin": True}, {}, {"is_admin": False}]
+
+    model_bulk_update(instances=users, fields=["is_admin"], data_per_instance=data)
+
+    users = list(BaseUser.objects.order_by("id"))
+    assert users[0].updated_at > before[0]
+    assert users[1].updated_at == before[1]
+    assert users[2].updated_at == before[2]
+
+
+def test_model_bulk_update_groups_writes_by_changed_fields(
+    users: list[BaseUser], django_assert_num_queries
+):
+    data = [{"is_admin": True}, {"is_admin": True}, {"is_active": False}]
+
+    # 3 unique email checks from full_clean, then 2 groups -> 2 UPDATEs in a savepoint
+    with django_assert_num_queries(7):
+        model_bulk_update(
+            instances=users, fields=["is_admin", "is_active"], data_per_instance=data
+        )
+
+
+def test_model_bulk_update_sets_m2m(users: list[BaseUser]):
+    group_a = Group.objects.create(name="a")
+    group_b = Group.objects.create(name="b")
+    users[0].groups.set([group_a])
+    data: list[dict] = [
+        {"groups": [group_b]},
+        {"groups": [group_a.pk, group_b.pk]},
+        {},
+    ]
+
+    _, updated = model_bulk_update(
+        instances=users, fields=["groups"], data_per_instance=data
+    )
+
+    assert updated == [True, True, False]
+    assert list(users[0].groups.all()) == [group_b]
+    assert set(users[1].groups.all()) == {group_a, group_b}
+    assert not users[2].groups.exists()
+
+
+def test_model_bulk_update_rejects_unknown_fields(users: list[BaseUser]):
+    with pytest.raises(AssertionError):
+        model_bulk_update(
+            instances=users, fields=["nope"], data_per_instance=[{}, {}, {}]
+        )
+
+
+def test_model_update_validate_changed_skips_unique_checks_on_unchanged(
+    users: list[BaseUser], django_assert_num_queries
+):
+    user = users[0]
+
+    # Only the UPDATE, no SELECT for the unique email
+    with django_assert_num_queries(1):
+        model_update(
+            instance=user,
+            fields=["is_admin"],
+            data={"is_admin": True},
+            validate="changed",
+        )
+
+    user.refresh_from_db()
+    assert user.is_admin
+
+
+def test_model_update_validate_changed_checks_changed_unique_fields(
+    users: list[BaseUser],
+):
+    with pytest.raises(ValidationError):
+        model_update(
+            instance=users[0],
+            fields=["email"],
+            data={"email": users[1].email},
+            validate="changed",
+        )
+
+
+def test_model_update_validate_none_skips_validation(users: list[BaseUser]):
+    user, has_updated = model_update(
+        instance=users[0],
+        fields=["email"],
+        data={"email": "not-an-email"},
+        validate="none",
+    )
+
+    assert has_updated
+    assert BaseUser.objects.filter(email="not-an-email").exists()
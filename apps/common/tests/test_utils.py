@@ -0,0 +1,28 @@
+from django.contrib.auth.models import Group
+
+from apps.common.utils import clear_model_field_meta, get_model_field_meta
+from apps.users.models import BaseUser
+
+
+def test_get_model_field_meta_is_cached_per_model():
+    meta = get_model_field_meta(BaseUser)
+
+    assert get_model_field_meta(BaseUser) is meta
+    assert get_model_field_meta(Group) is not meta
+
+
+def test_get_model_field_meta_content():
+    meta = get_model_field_meta(BaseUser)
+
+    assert "email" in meta.fields
+    assert meta.m2m_fields == {"groups", "user_permissions"}
+    assert meta.has_updated_at
+    assert not get_model_field_meta(Group).has_updated_at
+
+
+def test_clear_model_field_meta_drops_the_registry():
+    meta = get_model_field_meta(BaseUser)
+
+    clear_model_field_meta()
+
+    assert get_model_field_meta(BaseUser) is not meta
@@ -0,0 +1,27 @@
+import sys
+
+import pytest
+from django.urls import get_resolver
+
+from config.warmup import warmup
+
+
+def test_warmup_imports_app_modules_and_builds_caches():
+    report = warmup(connect=False)
+
+    assert report["modules"] > 0
+    assert report["models"] > 0
+    assert report["connections"] == []
+    assert set(report["timings"]) == {"imports", "urls", "models"}
+
+    assert "apps.users.apis" in sys.modules
+    assert get_resolver()._populated
+
+
+@pytest.mark.django_db
+def test_warmup_opens_connections_and_sends_requests():
+    report = warmup(imports=False, urls=["/api/users/"])
+
+    assert "default" in report["connections"]
+    assert report["requests"] == {"/api/users/": 403}
+    assert set(report["timings"]) == {"connections", "requests"}
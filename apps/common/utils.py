@@ -1,17 +1,27 @@
+from dataclasses import dataclass
+from typing import Any
+
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models.signals import class_prepared
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 
+from config.database_router import replica_reads
+
 
 def make_mock_object(**kwargs):
     return type("", (object,), kwargs)
 
 
+@replica_reads()
 def get_object(model_or_queryset, **kwargs):
     """
     Reuse get_object_or_404 since the implementation supports both Model && queryset.
     Catch Http404 & return None
+
+    Reads from the replica, if there is one & we haven't written recently.
     """
     try:
         return get_object_or_404(model_or_queryset, **kwargs)
@@ -44,3 +54,53 @@ def assert_settings(required_settings, error_message_prefix=""):
         )
 
     return values
+
+
+@dataclass(frozen=True)
+class ModelFieldMeta:
+    fields: dict[str, Any]
+    concrete_fields: frozenset[str]
+    m2m_fields: frozenset[str]
+    has_updated_at: bool
+
+
+_model_field_meta_registry: dict[type[models.Model], ModelFieldMeta] = {}
+
+
+def get_model_field_meta(model: type[models.Model]) -> ModelFieldMeta:
+    """
+    Field metadata shared by the generic services (e.g. `model_update`).
+    Computed once per model & cached, since it is the same for every instance.
+    """
+    meta = _model_field_meta_registry.get(model)
+
+    if meta is None:
+        fields = {field.name: field for field in model._meta.get_fields()}
+        meta = ModelFieldMeta(
+            fields=fields,
+            concrete_fields=frozenset(
+                name
+                for name, field in fields.items()
+                if getattr(field, "concrete", False)
+            ),
+            m2m_fields=frozenset(
+                name
+                for name, field in fields.items()
+                if isinstance(field, models.ManyToManyField)
+            ),
+            has_updated_at="updated_at" in fields,
+        )
+        _model_field_meta_registry[model] = meta
+
+    return meta
+
+
+def clear_model_field_meta(*args, **kwargs) -> None:
+    """
+    A newly prepared model can add reverse relations to already cached ones,
+    so we drop the whole registry (also useful after an app registry reload).
+    """
+    _model_field_meta_registry.clear()
+
+
+class_prepared.connect(clear_model_field_meta)
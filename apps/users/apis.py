@@ -0,0 +1,105 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+from rest_framework import exceptions, generics, serializers
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.api.permissions import IsAdmin
+from apps.common.middleware import query_budget
+from apps.users.services import BaseUserFilter, auser_list, user_list
+
+
+class UserOutputSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    email = serializers.EmailField()
+    is_active = serializers.BooleanField()
+    is_admin = serializers.BooleanField()
+    created_at = serializers.DateTimeField()
+
+
+# Session, request user & the page itself
+@query_budget(3)
+class UserListApi(generics.ListAPIView):
+    permission_classes = [IsAdmin]
+    serializer_class = UserOutputSerializer
+    filterset_class = BaseUserFilter
+
+    def get_queryset(self):
+        return user_list()
+
+
+@query_budget(3)
+class UserListAsyncApi(View):
+    """
+    ASGI-native counterpart of `UserListApi`, for async-heavy deployments.
+
+    DRF views are sync-only, so under ASGI every request to them goes through a
+    `sync_to_async` hop. This is a plain async Django view instead. It returns the
+    first page only (newest first), without cursors.
+
+    Authentication & permissions still go through DRF's classes (in a single hop,
+    since authenticators may hit the database) & errors through its exception
+    handler, so it behaves like `UserListApi` does.
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = [IsAdmin]
+
+    async def get(self, request: HttpRequest) -> JsonResponse:
+        drf_request = Request(
+            request, authenticators=[auth() for auth in self.authentication_classes]
+        )
+
+        try:
+            await sync_to_async(self.check_permissions)(drf_request)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc, drf_request)
+
+        users = await auser_list(filters=request.GET, limit=api_settings.PAGE_SIZE)
+
+        # Plain fields only, so serialization doesn't touch the database
+        return JsonResponse({"results": UserOutputSerializer(users, many=True).data})
+
+    def check_permissions(self, request: Request) -> None:
+        # Same as DRF's APIView.check_permissions
+        for permission in [permission() for permission in self.permission_classes]:
+            if permission.has_permission(request, self):
+                continue
+
+            if request.authenticators and not request.successful_authenticator:
+                raise exceptions.NotAuthenticated()
+
+            raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(
+        self, exc: exceptions.APIException, request: Request
+    ) -> JsonResponse:
+        # Same as DRF's APIView.handle_exception, 401 only with a WWW-Authenticate
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            auth_header = (
+                request.authenticators[0].authenticate_header(request)
+                if request.authenticators
+                else None
+            )
+
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = 403
+
+        response = api_settings.EXCEPTION_HANDLER(
+            exc, {"view": self, "request": request, "args": (), "kwargs": {}}
+        )
+
+        return JsonResponse(
+            response.data,
+            status=response.status_code,
+            headers={
+                name: value
+                for name, value in response.items()
+                if name.lower() != "content-type"
+            },
+        )
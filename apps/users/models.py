@@ -1,7 +1,9 @@
 import uuid
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.contrib.auth.models import BaseUserManager as BUM
+from django.core.exceptions import ValidationError
 from django.db import models
 
 from apps.common.models import BaseModel
@@ -37,6 +39,39 @@ class BaseUserManager(BUM["BaseUser"]):
 
         return user
 
+    async def acreate_user(
+        self, email: str, is_active=True, is_admin=False, password=None
+    ) -> "BaseUser":
+        """
+        Async counterpart of `create_user`. The unique email check & the insert go
+        through the async ORM. Password hashing is CPU-bound, so it is moved to a
+        thread, to keep it from blocking the event loop.
+        """
+        if not email:
+            raise ValueError("Users must have an email address")
+
+        user = self.model(
+            email=self.normalize_email(email.lower()),
+            is_active=is_active,
+            is_admin=is_admin,
+        )
+
+        if password is not None:
+            await sync_to_async(user.set_password, thread_sensitive=False)(password)
+        else:
+            user.set_unusable_password()
+
+        user.full_clean(validate_unique=False)
+
+        if await self.filter(email=user.email).aexists():
+            raise ValidationError(
+                {"email": [user.unique_error_message(self.model, ("email",))]}
+            )
+
+        await user.asave(using=self._db)
+
+        return user
+
     def create_superuser(self, email, password=None) -> "BaseUser":
         user = self.create_user(
             email=email,
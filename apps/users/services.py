@@ -1,11 +1,22 @@
-from typing import TypedDict
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.context import BaseContext
+from typing import Any, Literal, TypedDict, cast
 
 import django_filters
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Q
 from django.db.models.query import QuerySet
 
-from apps.common.services import model_update
+from apps.common.services import amodel_update, model_update
 from apps.users.models import BaseUser
+from apps.utils.processes import setup_django_worker
+from config.database_router import replica_db_for_read
 
 
 class BaseUserFilter(django_filters.FilterSet):
@@ -22,7 +33,19 @@ class UserDict(TypedDict):
     is_superuser: bool
 
 
+class UserBulkCreateReport(TypedDict):
+    status: Literal["created", "duplicate", "invalid"]
+    email: str
+    user: BaseUser | None
+    errors: dict[str, list[str]]
+
+
 def user_get_login_data(*, user: BaseUser) -> UserDict:
+    """
+    Built from the instance we already have, without any queries, so it isn't
+    cached. A cache lookup would cost more than this & could serve stale
+    permissions (e.g. `is_active`) after bulk updates.
+    """
     return UserDict(
         {
             "id": user.id,
@@ -35,13 +58,67 @@ def user_get_login_data(*, user: BaseUser) -> UserDict:
 
 
 def user_list(*, filters=None) -> QuerySet[BaseUser]:
+    """
+    The queryset is bound to the replica (if there is one & we haven't written
+    recently) when it's built, since it is evaluated lazily, outside of this function.
+    """
     filters = filters or {}
 
-    qs = BaseUser.objects.all()
+    qs = BaseUser.objects.using(replica_db_for_read()).all()
 
     return BaseUserFilter(filters, qs).qs
 
 
+async def auser_list(*, filters=None, limit: int | None = None) -> list[BaseUser]:
+    """
+    Async counterpart of `user_list`. Querysets are lazy, so this one evaluates it
+    (newest first, up to `limit` users), using async iteration instead of a
+    `sync_to_async` hop.
+    """
+    qs = user_list(filters=filters).order_by("-created_at", "-pk")
+
+    if limit is not None:
+        qs = qs[:limit]
+
+    return [user async for user in qs]
+
+
+def user_iter(*, filters=None, chunk_size: int = 2000) -> Iterator[UserDict]:
+    """
+    Streaming companion of `user_list`, meant for large exports.
+
+    Rows are fetched in chunks with keyset pagination on `(created_at, id)`, instead
+    of OFFSET or one unbounded query, and yielded as plain dicts without building
+    model instances. Memory stays flat regardless of the table size.
+    """
+    qs: QuerySet[BaseUser, dict[str, Any]] = (
+        user_list(filters=filters)
+        .order_by("created_at", "id")
+        .values(*UserDict.__annotations__, "created_at")
+    )
+
+    last_created_at, last_id = None, None
+
+    while True:
+        chunk = qs
+
+        if last_id is not None:
+            chunk = chunk.filter(
+                Q(created_at__gt=last_created_at)
+                | Q(created_at=last_created_at, id__gt=last_id)
+            )
+
+        rows = list(chunk[:chunk_size])
+
+        for row in rows:
+            last_created_at = row.pop("created_at")
+            last_id = row["id"]
+            yield cast(UserDict, row)
+
+        if len(rows) < chunk_size:
+            return
+
+
 def user_create(
     *,
     email: str,
@@ -56,12 +133,124 @@ def user_create(
     return user
 
 
+async def auser_create(
+    *,
+    email: str,
+    is_active: bool = True,
+    is_admin: bool = False,
+    password: str | None = None,
+) -> BaseUser:
+    user = await BaseUser.objects.acreate_user(
+        email=email, is_active=is_active, is_admin=is_admin, password=password
+    )
+
+    return user
+
+
+def user_bulk_create(
+    *,
+    rows: Iterable[dict[str, Any]],
+    batch_size: int = 1000,
+    hash_workers: int | None = None,
+) -> list[UserBulkCreateReport]:
+    """
+    Bulk counterpart of `user_create`, meant for onboarding many users at once.
+
+    Each row takes the same keys as `user_create`. The returned report has one entry
+    per row, in input order, telling whether the user was created, already existed
+    (in the database or earlier in `rows`), or failed validation.
+
+    Some important notes:
+        - Emails are lowercased & normalized, same as in `create_user`.
+        - Duplicates are checked with a single `email__in` query, not per row.
+        - Passwords are hashed in a process pool, since hashing is CPU-bound.
+          `hash_workers` defaults to the CPU count, use 1 to hash in-process.
+          Batches under `USER_HASH_POOL_MIN_PASSWORDS` are hashed in-process too.
+          Hashing happens before the transaction, so it doesn't hold the write lock.
+        - Users are inserted with `bulk_create`, so `save()` & its signals are skipped.
+          Emails taken while we were hashing are re-checked in the transaction &
+          reported as duplicates.
+    """
+    reports: list[UserBulkCreateReport] = []
+    candidates: dict[str, tuple[BaseUser, str | None]] = {}
+
+    for row in rows:
+        email = BaseUser.objects.normalize_email((row.get("email") or "").lower())
+        report = UserBulkCreateReport(
+            status="invalid", email=email, user=None, errors={}
+        )
+        reports.append(report)
+
+        if not email:
+            report["errors"] = {"email": ["Users must have an email address"]}
+            continue
+
+        if email in candidates:
+            report["status"] = "duplicate"
+            continue
+
+        user = BaseUser(
+            email=email,
+            is_active=row.get("is_active", True),
+            is_admin=row.get("is_admin", False),
+        )
+
+        try:
+            # Uniqueness is checked for the whole batch below
+            user.clean_fields(exclude=["password"])
+        except ValidationError as exc:
+            report["errors"] = exc.message_dict
+            continue
+
+        report["status"] = "created"
+        report["user"] = user
+        candidates[email] = (user, row.get("password"))
+
+    _user_bulk_create_mark_existing(reports=reports)
+
+    new_users = [
+        candidates[report["email"]][0]
+        for report in reports
+        if report["status"] == "created"
+    ]
+    passwords = [candidates[user.email][1] for user in new_users]
+
+    for user, password in zip(new_users, _user_hash_passwords(passwords, hash_workers)):
+        user.password = password
+
+    with transaction.atomic():
+        _user_bulk_create_mark_existing(reports=reports)
+
+        BaseUser.objects.bulk_create(
+            [report["user"] for report in reports if report["user"] is not None],
+            batch_size=batch_size,
+        )
+
+    return reports
+
+
+def _user_bulk_create_mark_existing(*, reports: list[UserBulkCreateReport]) -> None:
+    """
+    Marks the "created" reports whose email is already in the database as duplicates,
+    with a single `email__in` query.
+    """
+    emails = [report["email"] for report in reports if report["status"] == "created"]
+    existing = set(
+        BaseUser.objects.filter(email__in=emails).values_list("email", flat=True)
+    )
+
+    for report in reports:
+        if report["status"] == "created" and report["email"] in existing:
+            report["status"] = "duplicate"
+            report["user"] = None
+
+
 @transaction.atomic
 def user_update(*, user: BaseUser, data) -> BaseUser:
     non_side_effect_fields = ["first_name", "last_name"]
 
     user, has_updated = model_update(
-        instance=user, fields=non_side_effect_fields, data=data
+        instance=user, fields=non_side_effect_fields, data=data, validate="changed"
     )
 
     # Side-effect fields update here (e.g. username is generated based on first & last name)
@@ -69,3 +258,65 @@ def user_update(*, user: BaseUser, data) -> BaseUser:
     # ... some additional tasks with the user ...
 
     return user
+
+
+async def auser_update(*, user: BaseUser, data) -> BaseUser:
+    """
+    Async counterpart of `user_update`.
+
+    Django has no async `transaction.atomic` yet, so side effects that have to be
+    atomic with the update should stay in `user_update`.
+    """
+    non_side_effect_fields = ["first_name", "last_name"]
+
+    user, has_updated = await amodel_update(
+        instance=user, fields=non_side_effect_fields, data=data, validate="changed"
+    )
+
+    return user
+
+
+# Below this, starting the pool's workers costs more than hashing in-process
+USER_HASH_POOL_MIN_PASSWORDS = 32
+
+
+def _user_hash_pool_context() -> BaseContext:
+    # Not "fork": we're threaded (connection pools, the error log listener) & forking
+    # a threaded process can deadlock the child.
+    if "forkserver" in get_all_start_methods():
+        return get_context("forkserver")
+
+    return get_context("spawn")
+
+
+def _user_hash_passwords(
+    passwords: list[str | None],
+    workers: int | None,
+    mp_context: BaseContext | None = None,
+) -> list[str]:
+    """
+    `make_password(None)` gives an unusable password, same as `set_unusable_password`.
+    Those are cheap, so only the usable ones are sent to the pool.
+
+    Workers set Django up themselves, for start methods other than "fork", & there
+    are never more of them than passwords.
+    """
+    usable = [password for password in passwords if password is not None]
+    workers = min(workers or os.cpu_count() or 1, len(usable))
+
+    if workers <= 1 or len(usable) < USER_HASH_POOL_MIN_PASSWORDS:
+        return [make_password(password) for password in passwords]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context or _user_hash_pool_context(),
+        initializer=setup_django_worker,
+        initargs=(settings.SETTINGS_MODULE,),
+    ) as executor:
+        chunksize = max(1, len(usable) // (workers * 4))
+        hashed = iter(executor.map(make_password, usable, chunksize=chunksize))
+
+    return [
+        make_password(None) if password is None else next(hashed)
+        for password in passwords
+    ]
@@ -0,0 +1,64 @@
+import sqlite3
+from collections.abc import Iterator
+
+import pytest
+from django.db import connection
+
+from apps.users.tests.factories import UserFactory
+
+SEEDED_USERS = 1_000
+
+
+def _sqlite_copy(source: sqlite3.Connection, target: sqlite3.Connection) -> None:
+    # SQLite's online backup API copies the database page by page, which is a lot
+    # faster than re-inserting the rows.
+    source.backup(target)
+
+
+@pytest.fixture(scope="session")
+def seeded_db_snapshot(
+    django_db_setup, django_db_blocker
+) -> Iterator[sqlite3.Connection | None]:
+    """
+    Seeds `SEEDED_USERS` users once per session & keeps an in-memory copy of the
+    seeded database, which `seeded_db` restores for every test that needs it. The
+    test database itself is put back to its empty state, for all other tests.
+
+    Yields None on other databases than SQLite, where `seeded_db` seeds per test.
+    """
+    with django_db_blocker.unblock():
+        connection.ensure_connection()
+
+        if connection.vendor != "sqlite":
+            yield None
+            return
+
+        empty = sqlite3.connect(":memory:")
+        seeded = sqlite3.connect(":memory:")
+
+        _sqlite_copy(connection.connection, empty)
+        UserFactory.create_batch_fast(SEEDED_USERS)
+        _sqlite_copy(connection.connection, seeded)
+        _sqlite_copy(empty, connection.connection)
+        empty.close()
+
+    yield seeded
+
+    seeded.close()
+
+
+@pytest.fixture
+def seeded_db(transactional_db, seeded_db_snapshot: sqlite3.Connection | None) -> int:
+    """
+    A database with `SEEDED_USERS` users, restored from the session's snapshot.
+
+    Needs a transactional test, since a database can't be restored in the middle
+    of a transaction. The database is flushed after the test, as usual.
+    """
+    if seeded_db_snapshot is None:
+        UserFactory.create_batch_fast(SEEDED_USERS)
+    else:
+        connection.ensure_connection()
+        _sqlite_copy(seeded_db_snapshot, connection.connection)
+
+    return SEEDED_USERS
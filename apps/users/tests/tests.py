@@ -1,8 +1,28 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
 import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password, is_password_usable
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
+from apps.common.services import amodel_update, model_bulk_update
 from apps.users.models import BaseUser
-from apps.users.services import user_create
+from apps.users.services import (
+    _user_hash_passwords,
+    auser_create,
+    auser_list,
+    user_bulk_create,
+    user_create,
+    user_get_login_data,
+    user_iter,
+)
+from apps.users.tests.factories import DUMMY_PASSWORD, UserFactory
 
 
 @pytest.fixture
@@ -26,3 +46,268 @@ def test_user_with_capitalized_email_cannot_be_created_if_uncapitalized_exists(
         user_create(email=email)
 
     assert BaseUser.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_user_iter_yields_all_users_in_created_order_across_chunks():
+    created_at = timezone.now()
+    users = [user_create(email=f"user_{i}@example.com") for i in range(5)]
+    # Same timestamp for all, so the id tiebreaker has to do the work
+    BaseUser.objects.update(created_at=created_at)
+
+    rows = list(user_iter(chunk_size=2))
+
+    assert [row["id"] for row in rows] == [user.id for user in users]
+    assert rows[0] == user_get_login_data(user=users[0])
+
+
+@pytest.mark.django_db
+def test_user_iter_applies_filters():
+    user_create(email="user@example.com")
+    admin = user_create(email="admin@example.com", is_admin=True)
+
+    rows = list(user_iter(filters={"is_admin": True}))
+
+    assert [row["id"] for row in rows] == [admin.id]
+
+
+@pytest.mark.django_db
+def test_user_bulk_create_reports_per_row(user: BaseUser):
+    reports = user_bulk_create(
+        rows=[
+            {"email": "New@Example.com", "password": "pass"},
+            {"email": user.email.upper()},
+            {"email": "new@example.com"},
+            {"email": "not-an-email"},
+            {"email": ""},
+        ],
+        hash_workers=1,
+    )
+
+    assert [report["status"] for report in reports] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "invalid",
+        "invalid",
+    ]
+    assert "email" in reports[3]["errors"]
+
+    created = BaseUser.objects.get(email="new@example.com")
+    assert reports[0]["user"] == created
+    assert created.check_password("pass")
+    assert BaseUser.objects.count() == 2
+
+
+@pytest.fixture
+def hash_pool_for_any_batch(monkeypatch) -> None:
+    monkeypatch.setattr("apps.users.services.USER_HASH_POOL_MIN_PASSWORDS", 2)
+
+
+@pytest.mark.django_db
+def test_user_bulk_create_hashes_passwords_in_a_process_pool(
+    hash_pool_for_any_batch: None,
+):
+    rows = [
+        {"email": f"user_{i}@example.com", "password": f"pass_{i}"} for i in range(4)
+    ]
+    rows.append({"email": "no_password@example.com"})
+
+    user_bulk_create(rows=rows, hash_workers=2)
+
+    users = {user.email: user for user in BaseUser.objects.all()}
+    assert users["user_3@example.com"].check_password("pass_3")
+    assert not users["no_password@example.com"].has_usable_password()
+
+
+@pytest.mark.django_db
+def test_user_bulk_create_reports_emails_taken_while_hashing(monkeypatch):
+    def hash_passwords(passwords, workers):
+        user_create(email="taken@example.com")
+
+        return _user_hash_passwords(passwords, workers)
+
+    monkeypatch.setattr("apps.users.services._user_hash_passwords", hash_passwords)
+
+    reports = user_bulk_create(
+        rows=[{"email": "taken@example.com"}, {"email": "free@example.com"}],
+        hash_workers=1,
+    )
+
+    assert [report["status"] for report in reports] == ["duplicate", "created"]
+    assert BaseUser.objects.count() == 2
+
+
+def test_user_hash_passwords_sets_up_spawned_workers(hash_pool_for_any_batch: None):
+    passwords = _user_hash_passwords(
+        ["pass_1", "pass_2", None], 2, mp_context=get_context("spawn")
+    )
+
+    assert check_password("pass_2", passwords[1])
+    assert not is_password_usable(passwords[2])
+
+
+def test_user_hash_passwords_caps_the_workers_and_keeps_small_batches_in_process(
+    monkeypatch,
+):
+    pools = []
+
+    class Pool(ProcessPoolExecutor):
+        def __init__(self, max_workers, **kwargs):
+            pools.append(max_workers)
+            super().__init__(max_workers, **kwargs)
+
+    monkeypatch.setattr("apps.users.services.ProcessPoolExecutor", Pool)
+
+    _user_hash_passwords(["pass_1", "pass_2"], 64)
+    assert pools == []
+
+    monkeypatch.setattr("apps.users.services.USER_HASH_POOL_MIN_PASSWORDS", 2)
+    passwords = _user_hash_passwords(["pass_1", "pass_2"], 64)
+
+    assert pools == [2]
+    assert check_password("pass_1", passwords[0])
+
+
+@pytest.mark.django_db
+def test_user_get_login_data_reflects_bulk_updates(user: BaseUser):
+    assert user_get_login_data(user=user)["is_active"] is True
+
+    model_bulk_update(
+        instances=[user], fields=["is_active"], data_per_instance=[{"is_active": False}]
+    )
+
+    assert user_get_login_data(user=user)["is_active"] is False
+
+
+@pytest.mark.django_db
+def test_auser_create_checks_unique_email_asynchronously(user: BaseUser):
+    created = async_to_sync(auser_create)(email="New@example.com", password="pass")
+
+    assert created.email == "new@example.com"
+    assert created.check_password("pass")
+
+    with pytest.raises(ValidationError):
+        async_to_sync(auser_create)(email=user.email.upper())
+
+
+@pytest.mark.django_db
+def test_amodel_update_validates_and_saves(user: BaseUser):
+    other = user_create(email="other@example.com")
+
+    user, has_updated = async_to_sync(amodel_update)(
+        instance=user, fields=["is_admin"], data={"is_admin": True}, validate="changed"
+    )
+    assert has_updated
+
+    with pytest.raises(ValidationError):
+        async_to_sync(amodel_update)(
+            instance=user, fields=["email"], data={"email": other.email}
+        )
+
+    assert BaseUser.objects.get(pk=user.pk).is_admin
+
+
+@pytest.mark.django_db
+def test_amodel_update_skips_unique_checks_without_changed_unique_fields(
+    user: BaseUser, django_assert_num_queries
+):
+    # Just the UPDATE, email isn't re-checked
+    with django_assert_num_queries(1):
+        async_to_sync(amodel_update)(
+            instance=user,
+            fields=["is_admin"],
+            data={"is_admin": True},
+            validate="changed",
+        )
+
+    # The changed email is checked first
+    with django_assert_num_queries(2):
+        async_to_sync(amodel_update)(
+            instance=user,
+            fields=["email"],
+            data={"email": "changed@example.com"},
+            validate="changed",
+        )
+
+
+@pytest.mark.django_db
+def test_auser_list_applies_filters_and_limit():
+    for i in range(3):
+        user_create(email=f"admin_{i}@example.com", is_admin=True)
+    user_create(email="user@example.com")
+
+    users = async_to_sync(auser_list)(filters={"is_admin": True}, limit=2)
+
+    assert [user.email for user in users] == [
+        "admin_2@example.com",
+        "admin_1@example.com",
+    ]
+
+
+@pytest.mark.django_db
+def test_user_list_apis_are_admin_only(user: BaseUser):
+    admin = user_create(email="admin@example.com", is_admin=True)
+    client = Client()
+
+    for url in (reverse("api:users:list"), reverse("api:users:list-async")):
+        client.logout()
+        response = client.get(url)
+        assert response.status_code == 403
+        assert response.json() == {
+            "message": "Authentication credentials were not provided.",
+            "extra": {},
+        }
+
+        client.force_login(user)
+        assert client.get(url).status_code == 403
+
+        client.force_login(admin)
+        response = client.get(url, {"is_admin": True})
+        assert response.status_code == 200
+        assert [row["email"] for row in response.json()["results"]] == [admin.email]
+
+
+@pytest.fixture
+def admin_client(db) -> Client:
+    admin = user_create(email="admin@example.com", is_admin=True)
+    client = Client()
+    client.force_login(admin)
+
+    return client
+
+
+@pytest.fixture
+def many_users(db) -> None:
+    user_bulk_create(rows=[{"email": f"user{i}@example.com"} for i in range(20)])
+
+
+@pytest.mark.nplusone(threshold=2)
+def test_user_list_api_runs_a_constant_number_of_queries(
+    many_users: None, admin_client: Client, assert_max_queries
+):
+    # Session, request user & the page
+    with assert_max_queries(3):
+        response = admin_client.get(reverse("api:users:list"))
+
+    assert len(response.json()["results"]) == 21
+
+
+@pytest.mark.django_db
+def test_user_factory_create_batch_fast_creates_unique_users_in_bulk():
+    with CaptureQueriesContext(connection) as queries:
+        users = UserFactory.create_batch_fast(2_500, batch_size=1000)
+
+    # Batched INSERTs only, no per-user lookups
+    assert len(queries) < 100
+    assert all(query["sql"].startswith("INSERT") for query in queries)
+    assert BaseUser.objects.count() == 2_500
+    assert len({user.email for user in users}) == 2_500
+    assert users[0].check_password(DUMMY_PASSWORD)
+
+
+@pytest.mark.parametrize("run", [1, 2])
+def test_seeded_db_is_restored_for_every_test(seeded_db: int, run: int):
+    assert BaseUser.objects.count() == seeded_db
+
+    BaseUser.objects.all().delete()
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from apps.users.apis import UserListApi, UserListAsyncApi
+
+urlpatterns = [
+    path("", UserListApi.as_view(), name="list"),
+    path("async/", UserListAsyncApi.as_view(), name="list-async"),
+]
@@ -1,10 +1,45 @@
+import os
+
 from faker import Faker
 
 fkr = None
 
 
+def get_worker_id() -> str:
+    """
+    The pytest-xdist worker running us ("gw0", "gw1", ...), or "main" when tests
+    (or anything else) run in a single process.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
 def get_faker() -> Faker:
+    """
+    A process-wide Faker, random unless `FAKER_SEED` is set, which makes the data
+    reproducible. Each xdist worker then mixes its own id into the seed, so workers
+    generate different data, each one reproducible on its own.
+    """
     global fkr
     if not fkr:
         fkr = Faker()
+
+        seed = os.environ.get("FAKER_SEED")
+
+        if seed is not None:
+            fkr.seed_instance(f"{seed}:{get_worker_id()}")
     return fkr
+
+
+def worker_email(email: str) -> str:
+    """
+    Tags an email with the xdist worker (`local+gw0@domain`), so emails generated
+    by different workers never clash, even if they share a database.
+    """
+    worker_id = get_worker_id()
+
+    if worker_id == "main":
+        return email
+
+    local, domain = email.split("@")
+
+    return f"{local}+{worker_id}@{domain}"
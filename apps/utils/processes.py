@@ -0,0 +1,17 @@
+import os
+
+import django
+from django.conf import settings
+
+
+def setup_django_worker(settings_module: str) -> None:
+    """
+    `initializer` for process pools that run Django code.
+
+    Forked workers inherit configured settings, but with the "spawn" & "forkserver"
+    start methods (macOS, the default since Python 3.14) they start from scratch.
+    Keep this module free of model imports, so workers can import it before setup.
+    """
+    if not settings.configured:
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+        django.setup()
@@ -0,0 +1,220 @@
+"""
+Query recording for the test suite, loaded via the root conftest.py.
+
+N+1 DETECTION
+
+Records the queries run by a test (the test body, not its fixtures) on every
+database alias. SELECTs are fingerprinted, i.e. literals & parameters are replaced
+with `?`, so `... WHERE id = 1` & `... WHERE id = 2` are the same query. A
+fingerprint repeated `threshold` or more times fails the test as an N+1, with the
+stack of the first repeat.
+
+Enable it for a test (or module, via `pytestmark`) with:
+
+    @pytest.mark.nplusone
+    @pytest.mark.nplusone(threshold=10)
+
+or for the whole suite, with the ini options (opt out per test with
+`@pytest.mark.nplusone(enabled=False)`):
+
+    nplusone_detect = true
+    nplusone_threshold = 5
+
+QUERY LIMITS
+
+    with assert_max_queries(3):
+        list(user_list())
+
+Also available as a fixture of the same name.
+"""
+
+import re
+import traceback
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from django.db import connections
+
+NPLUSONE_DEFAULT_THRESHOLD = 5
+
+_PROJECT_DIR = str(Path(__file__).resolve().parent.parent.parent)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sql_fingerprint(sql: str) -> str:
+    """
+    Normalizes literals & placeholders to `?` (and `IN (?, ?, ...)` to `IN (...)`),
+    so queries differing only in their values get the same fingerprint.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    fingerprint: str
+    # Project frames only, captured for the first repeat of a fingerprint
+    stack: list[str] = field(default_factory=list)
+
+
+class QueryRecorder:
+    """
+    An `execute_wrapper`, installed on every connection by `record`.
+    """
+
+    def __init__(self):
+        self.queries: list[RecordedQuery] = []
+        self.fingerprints: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        fingerprint = sql_fingerprint(sql)
+        self.fingerprints[fingerprint] += 1
+
+        query = RecordedQuery(sql=sql, fingerprint=fingerprint)
+
+        if self.fingerprints[fingerprint] == 2:
+            query.stack = _project_stack()
+
+        self.queries.append(query)
+
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def record(self) -> Iterator["QueryRecorder"]:
+        with ExitStack() as stack:
+            for connection in connections.all(initialized_only=False):
+                stack.enter_context(connection.execute_wrapper(self))
+
+            yield self
+
+    def n_plus_ones(self, threshold: int) -> list[tuple[RecordedQuery, int]]:
+        """
+        (first repeat, count) of every SELECT fingerprint seen `threshold`+ times.
+        """
+        repeated = {
+            fingerprint: count
+            for fingerprint, count in self.fingerprints.items()
+            if count >= threshold and fingerprint.upper().startswith("SELECT")
+        }
+        first_repeats: dict[str, RecordedQuery] = {}
+
+        for query in self.queries:
+            if query.fingerprint in repeated and query.stack:
+                first_repeats.setdefault(query.fingerprint, query)
+
+        return [
+            (query, repeated[fingerprint])
+            for fingerprint, query in first_repeats.items()
+        ]
+
+    def report(self, threshold: int) -> str | None:
+        n_plus_ones = self.n_plus_ones(threshold)
+
+        if not n_plus_ones:
+            return None
+
+        lines = [f"N+1 queries detected (threshold {threshold}):"]
+
+        for query, count in n_plus_ones:
+            lines += ["", f"{count}x {query.fingerprint}", "First repeat at:"]
+            lines += query.stack
+
+        return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(n: int) -> Iterator[QueryRecorder]:
+    """
+    Fails if the block runs more than `n` queries, on any database alias.
+    """
+    recorder = QueryRecorder()
+
+    with recorder.record():
+        yield recorder
+
+    count = len(recorder.queries)
+
+    if count > n:
+        queries = "\n".join(
+            f"{i}. {query.sql}" for i, query in enumerate(recorder.queries, 1)
+        )
+        raise AssertionError(f"Expected at most {n} queries, got {count}:\n{queries}")
+
+
+def _project_stack() -> list[str]:
+    frames = traceback.extract_stack()[:-2]
+
+    return [
+        line.rstrip()
+        for frame in frames
+        if frame.filename.startswith(_PROJECT_DIR)
+        and "site-packages" not in frame.filename
+        and frame.filename != __file__
+        for line in traceback.format_list([frame])
+    ]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addini(
+        "nplusone_detect",
+        type="bool",
+        default=False,
+        help="Fail every test running N+1 queries.",
+    )
+    parser.addini(
+        "nplusone_threshold",
+        default=str(NPLUSONE_DEFAULT_THRESHOLD),
+        help="Repeats of the same SELECT that count as an N+1.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "nplusone(threshold=None, enabled=True): fail the test on N+1 queries.",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    marker = item.get_closest_marker("nplusone")
+    enabled = item.config.getini("nplusone_detect")
+    threshold = int(item.config.getini("nplusone_threshold"))
+
+    if marker is not None:
+        enabled = marker.kwargs.get("enabled", True)
+        threshold = marker.kwargs.get("threshold") or threshold
+
+    if not enabled:
+        return (yield)
+
+    recorder = QueryRecorder()
+
+    with recorder.record():
+        result = yield
+
+    report = recorder.report(threshold)
+
+    if report is not None:
+        pytest.fail(report, pytrace=False)
+
+    return result
+
+
+@pytest.fixture(name="assert_max_queries")
+def assert_max_queries_fixture():
+    return assert_max_queries
@@ -0,0 +1,30 @@
+from apps.utils import faker
+from apps.utils.faker import get_faker, worker_email
+
+
+def test_worker_email_is_tagged_with_the_xdist_worker(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert worker_email("john@example.com") == "john@example.com"
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert worker_email("john@example.com") == "john+gw3@example.com"
+
+
+def _fresh_faker_name(monkeypatch) -> str:
+    monkeypatch.setattr(faker, "fkr", None)
+
+    return get_faker().name()
+
+
+def test_get_faker_is_only_seeded_with_faker_seed(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    monkeypatch.delenv("FAKER_SEED", raising=False)
+    # Random, even under xdist. Ten names are very unlikely to all match.
+    assert len({_fresh_faker_name(monkeypatch) for _ in range(10)}) > 1
+
+    monkeypatch.setenv("FAKER_SEED", "42")
+    gw1_name = _fresh_faker_name(monkeypatch)
+    assert _fresh_faker_name(monkeypatch) == gw1_name
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw2")
+    assert _fresh_faker_name(monkeypatch) != gw1_name
@@ -0,0 +1,57 @@
+import pytest
+
+from apps.users.models import BaseUser
+from apps.users.services import user_create, user_list
+from apps.utils.pytest_plugin import QueryRecorder, assert_max_queries, sql_fingerprint
+
+
+@pytest.fixture
+def users(db) -> list[BaseUser]:
+    # Fixtures aren't checked for N+1s, only the test body
+    return [user_create(email=f"user{i}@example.com") for i in range(3)]
+
+
+def test_sql_fingerprint_normalizes_literals_and_placeholders():
+    assert sql_fingerprint(
+        "SELECT * FROM t1 WHERE id = 12 AND email = 'o''hara@x.com'\n AND x IN (%s, %s)"
+    ) == sql_fingerprint("SELECT * FROM t1 WHERE id = %s AND email = %s AND x IN (?)")
+
+
+def test_query_recorder_reports_n_plus_ones_with_their_stack(users: list[BaseUser]):
+    with QueryRecorder().record() as recorder:
+        for user in users:
+            BaseUser.objects.get(pk=user.pk)
+
+    assert recorder.report(threshold=4) is None
+
+    report = recorder.report(threshold=3)
+    assert report is not None
+    assert report.startswith("N+1 queries detected (threshold 3):")
+    assert "3x SELECT" in report
+    assert __file__ in report
+
+
+@pytest.mark.nplusone(threshold=3)
+def test_nplusone_marker_passes_below_the_threshold(users: list[BaseUser]):
+    for user in users[:2]:
+        BaseUser.objects.get(pk=user.pk)
+
+
+@pytest.mark.nplusone(threshold=3)
+@pytest.mark.xfail(raises=pytest.fail.Exception, strict=True)
+def test_nplusone_marker_fails_the_test(users: list[BaseUser]):
+    for user in users:
+        BaseUser.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_assert_max_queries():
+    user_create(email="user@example.com")
+
+    with assert_max_queries(1):
+        list(user_list())
+
+    with pytest.raises(AssertionError, match="Expected at most 1 queries, got 2"):
+        with assert_max_queries(1):
+            list(user_list())
+            list(user_list())
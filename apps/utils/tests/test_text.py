@@ -1,67 +1,109 @@
 import pytest
+from django.contrib.auth.models import Group
+from django.db import IntegrityError
 
-from apps.utils.text import slugify_unique
+from apps.utils.text import (
+    slugify_unique,
+    slugify_unique_create,
+    slugify_unique_many,
+)
+
+# Group.name is a unique CharField, which makes it a good stand-in for a slug field.
 
 
 @pytest.fixture
-def mock_db_model():
-    pass
+def existing_slugs(db):
+    def _create(*slugs: str) -> None:
+        Group.objects.bulk_create([Group(name=slug) for slug in slugs])
 
+    return _create
 
-@pytest.fixture
-def mock_model_class():
-    """Fixture for a mock model class."""
 
-    class MockQuerySet:
-        def values_list(self, field_name, flat):
-            return []
+def test_slugify_unique_no_conflict(db):
+    unique_slug = slugify_unique(Group, "New Slug", slug_field="name")
+    assert unique_slug == "new-slug"
 
-    class MockManager:
-        def filter(self, *args, **kwargs):
-            return MockQuerySet()
 
-    class MockModel:
-        _default_manager = MockManager()
+def test_slugify_unique_with_conflicts(existing_slugs):
+    existing_slugs("example-slug", "example-slug-1", "example-slug-2")
 
-    return MockModel
+    unique_slug = slugify_unique(Group, "Example Slug", slug_field="name")
+    assert unique_slug == "example-slug-3"
 
 
-def test_slugify_unique_no_conflict(mock_model_class):
-    unique_slug = slugify_unique(mock_model_class, "New Slug")
-    assert unique_slug == "new-slug"
+def test_slugify_unique_uses_max_suffix(existing_slugs):
+    existing_slugs("example-slug", "example-slug-7", "example-slug-10")
 
+    unique_slug = slugify_unique(Group, "Example Slug", slug_field="name")
+    assert unique_slug == "example-slug-11"
 
-def test_slugify_unique_with_conflicts(mock_model_class):
-    def mock_filter(**kwargs):
-        class MockQuerySet:
-            def values_list(self, field_name, flat):
-                return [
-                    "example-slug",
-                    "example-slug-1",
-                    "example-slug-2",
-                ]  # Existing slugs
 
-        return MockQuerySet()
+def test_slugify_unique_ignores_zero_padded_suffixes(existing_slugs):
+    existing_slugs("post", "post-007", "post-8")
 
-    mock_model_class._default_manager.filter = mock_filter
+    unique_slug = slugify_unique(Group, "Post", slug_field="name")
+    assert unique_slug == "post-9"
 
-    # Test with conflicting slugs
-    unique_slug = slugify_unique(mock_model_class, "Example Slug")
-    assert unique_slug == "example-slug-3"
 
+def test_slugify_unique_ignores_non_numeric_prefix_matches(existing_slugs):
+    existing_slugs("example-slug-extra", "example-slugs")
+
+    unique_slug = slugify_unique(Group, "Example Slug", slug_field="name")
+    assert unique_slug == "example-slug"
+
+
+def test_slugify_unique_create_retries_on_integrity_error(db):
+    attempts = []
+
+    def create(slug: str) -> Group:
+        attempts.append(slug)
+        if len(attempts) == 1:
+            # Simulate a concurrent insert taking the slug before us
+            raise IntegrityError
+        return Group.objects.create(name=slug)
+
+    group = slugify_unique_create(Group, "Post", create, slug_field="name")
+
+    assert len(attempts) == 2
+    assert group.name == "post"
 
-def test_slugify_unique_with_custom_field(mock_model_class):
-    def mock_filter(**kwargs):
-        class MockQuerySet:
-            def values_list(self, field_name, flat):
-                return ["custom-slug", "custom-slug-1"]
 
-        return MockQuerySet()
+def test_slugify_unique_create_gives_up_after_max_attempts(db):
+    def create(slug: str) -> Group:
+        raise IntegrityError
 
-    mock_model_class._default_manager.filter = mock_filter
+    with pytest.raises(IntegrityError):
+        slugify_unique_create(Group, "Post", create, slug_field="name", max_attempts=2)
 
-    # Test with custom slug field
-    unique_slug = slugify_unique(
-        mock_model_class, "Custom Slug", slug_field="custom_field"
+
+def test_slugify_unique_many_keeps_input_order(db):
+    slugs = slugify_unique_many(Group, ["B Post", "A Post"], slug_field="name")
+    assert slugs == ["b-post", "a-post"]
+
+
+def test_slugify_unique_many_with_conflicts_within_batch(db):
+    slugs = slugify_unique_many(Group, ["Post", "post", "POST"], slug_field="name")
+    assert slugs == ["post", "post-1", "post-2"]
+
+
+def test_slugify_unique_many_with_existing_conflicts(existing_slugs):
+    existing_slugs("post", "post-4", "other")
+
+    slugs = slugify_unique_many(
+        Group, ["Post", "Other", "New", "Post"], slug_field="name"
     )
-    assert unique_slug == "custom-slug-2"
+    assert slugs == ["post-5", "other-1", "new", "post-6"]
+
+
+def test_slugify_unique_many_does_not_clash_with_suffix_like_bases(db):
+    slugs = slugify_unique_many(Group, ["Post 1", "Post", "Post"], slug_field="name")
+    assert slugs == ["post-1", "post", "post-2"]
+
+
+def test_slugify_unique_many_uses_a_single_query(
+    existing_slugs, django_assert_num_queries
+):
+    existing_slugs("post", "post-1")
+
+    with django_assert_num_queries(1):
+        slugify_unique_many(Group, ["Post", "Other", "Post"], slug_field="name")
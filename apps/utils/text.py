@@ -1,23 +1,147 @@
-from itertools import count
+import re
+from collections.abc import Callable, Iterable
+from functools import reduce
+from operator import or_
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Length
 from django.utils.text import slugify
 
 
 def slugify_unique(
     model_class: type[models.Model], text: str, slug_field="slug"
 ) -> str:
+    """
+    Slugifies `text` and appends a numeric suffix, if the slug is already taken.
+
+    The next free suffix is the max existing one + 1. The database orders the
+    candidates for us, so we don't load every `<slug>-N` row into memory.
+    """
     slug = slugify(text, allow_unicode=False)
-    slug_matches = model_class._default_manager.filter(
-        **{f"{slug_field}__startswith": slug}
-    ).values_list(slug_field, flat=True)
 
-    num_of_matches = len(slug_matches)
-    if num_of_matches < 1:
+    max_suffix = _slug_max_suffix(model_class, slug, slug_field)
+
+    if max_suffix is None:
         return slug
 
-    for i in count(num_of_matches):
-        new_slug = f"{slug}-{i}"
-        if new_slug not in slug_matches:
-            break
-    return new_slug
+    return f"{slug}-{max_suffix + 1}"
+
+
+def slugify_unique_create[T: models.Model](
+    model_class: type[T],
+    text: str,
+    create: Callable[[str], T],
+    slug_field="slug",
+    max_attempts: int = 3,
+) -> T:
+    """
+    Calls `create` with a unique slug. If a concurrent insert grabs the same slug
+    first (i.e. `create` raises IntegrityError), a new slug is computed & retried.
+    """
+    attempt = 1
+
+    while True:
+        slug = slugify_unique(model_class, text, slug_field=slug_field)
+
+        try:
+            with transaction.atomic():
+                return create(slug)
+        except IntegrityError:
+            if attempt >= max_attempts:
+                raise
+
+        attempt += 1
+
+
+def slugify_unique_many(
+    model_class: type[models.Model], texts: Iterable[str], slug_field="slug"
+) -> list[str]:
+    """
+    Batch version of `slugify_unique`, meant for bulk imports.
+
+    Existing collisions for all base slugs are fetched in a single query & suffixes
+    are assigned in memory, so texts sharing a base slug within the batch also get
+    unique slugs. The slugs are returned in input order, so they can be zipped with
+    the rows passed to `bulk_create`.
+    """
+    bases = [slugify(text, allow_unicode=False) for text in texts]
+
+    if not bases:
+        return []
+
+    unique_bases = set(bases)
+    lookups = [Q(**{f"{slug_field}__in": unique_bases})] + [
+        Q(**{f"{slug_field}__startswith": f"{base}-"}) for base in unique_bases
+    ]
+    taken = set(
+        model_class._default_manager.filter(reduce(or_, lookups)).values_list(
+            slug_field, flat=True
+        )
+    )
+
+    # base slug -> next suffix to try, only for bases that are already taken
+    next_suffixes: dict[str, int] = {}
+
+    for existing in taken:
+        if existing in unique_bases:
+            next_suffixes.setdefault(existing, 1)
+
+        base, _, suffix = existing.rpartition("-")
+
+        if base in unique_bases and suffix.isascii() and suffix.isdigit():
+            next_suffixes[base] = max(next_suffixes.get(base, 1), int(suffix) + 1)
+
+    slugs = []
+
+    for base in bases:
+        suffix = next_suffixes.get(base)
+        slug = base if suffix is None else f"{base}-{suffix}"
+        suffix = suffix or 0
+
+        # A generated `<base>-N` can still clash with another text's base slug
+        while slug in taken:
+            suffix += 1
+            slug = f"{base}-{suffix}"
+
+        next_suffixes[base] = suffix + 1
+        taken.add(slug)
+        slugs.append(slug)
+
+    return slugs
+
+
+def _slug_max_suffix(
+    model_class: type[models.Model], slug: str, slug_field: str
+) -> int | None:
+    """
+    Returns the max numeric suffix among `<slug>` & `<slug>-N` rows, where `<slug>`
+    itself counts as 0. None, if there are no such rows.
+
+    Only canonical suffixes count, i.e. not zero-padded ones like "post-007". We
+    never generate those & they can't clash with the ones we do ("post-7").
+
+    The database filters out the other `<slug>-...` rows (e.g. "post-about-django")
+    & the prefix lookup narrows the rows the regex runs on. Longer canonical
+    suffixes are always bigger, so ordering by length & then by value puts the max
+    suffix first, which is the only row fetched.
+    """
+    suffixed = Q(**{f"{slug_field}__startswith": f"{slug}-"}) & Q(
+        **{f"{slug_field}__regex": rf"^{re.escape(slug)}-(0|[1-9][0-9]*)$"}
+    )
+    existing = (
+        model_class._default_manager.filter(Q(**{slug_field: slug}) | suffixed)
+        .annotate(_slug_length=Length(slug_field))
+        .order_by("-_slug_length", f"-{slug_field}")
+        .values_list(slug_field, flat=True)
+        .first()
+    )
+
+    if existing is None:
+        return None
+
+    # The exact slug is the shortest, so we only get it without numeric suffixes
+    if existing == slug:
+        return 0
+
+    return int(existing[len(slug) + 1 :])
@@ -0,0 +1,38 @@
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django() -> None:
+    """
+    Benchmarks are plain scripts (`python -m benchmarks.<module>`), so Django has to
+    be configured by hand. The test settings are used, same as in pytest.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.django.test")
+    os.environ.setdefault("SECRET_KEY", "benchmarks")
+    django.setup()
+
+
+@contextmanager
+def test_database() -> Iterator[None]:
+    """
+    Creates a throwaway test database (same as pytest-django does) & drops it after.
+    The test environment is set up as well, e.g. for the test client's host.
+    """
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
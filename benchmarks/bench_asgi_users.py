@@ -0,0 +1,69 @@
+"""
+Request throughput of the sync (DRF) vs async user list endpoints under ASGI.
+
+Requests go through Django's ASGI handler in-process (the same callable uvicorn
+would serve), `--concurrency` at a time, so the numbers show the handler &
+`sync_to_async` overhead rather than network or server costs.
+
+Run with:
+    python -m benchmarks.bench_asgi_users [--requests 500] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks._django import setup_django, test_database
+
+setup_django()
+
+from django.test import AsyncClient, Client  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from apps.users.services import user_bulk_create, user_create  # noqa: E402
+
+
+async def run(url: str, cookies, requests: int, concurrency: int) -> float:
+    client = AsyncClient()
+    client.cookies = cookies
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            response = await client.get(url)
+            assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    with test_database():
+        user_bulk_create(
+            rows=[{"email": f"user_{i}@example.com"} for i in range(200)],
+            hash_workers=1,
+        )
+        admin = user_create(email="admin@example.com", is_admin=True)
+
+        client = Client()
+        client.force_login(admin)
+
+        for name in ("list", "list-async"):
+            url = reverse(f"api:users:{name}")
+            # Warm up URL resolving, serializers, etc.
+            asyncio.run(run(url, client.cookies, 20, args.concurrency))
+            throughput = asyncio.run(
+                run(url, client.cookies, args.requests, args.concurrency)
+            )
+            print(f"{name:>10}: {throughput:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
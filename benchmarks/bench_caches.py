@@ -0,0 +1,86 @@
+"""
+get/set throughput of the cache backends across several worker processes, the way
+gunicorn workers would use them.
+
+Every worker sets its own keys & then reads the whole key space, so the hit ratio
+shows how much of what other workers cached is actually visible to a worker.
+
+Run with:
+    python -m benchmarks.bench_caches [--workers 8] [--keys 2000]
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+from benchmarks._django import setup_django
+
+setup_django()
+
+from django.utils.module_loading import import_string  # noqa: E402
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "shared": "apps.common.cache_backends.SharedFileCache",
+}
+
+
+def _make_cache(backend: str, location: str):
+    return import_string(BACKENDS[backend])(
+        location, {"OPTIONS": {"MAX_ENTRIES": 1_000_000}}
+    )
+
+
+def _worker(backend: str, location: str, worker: int, workers: int, keys: int):
+    cache = _make_cache(backend, location)
+    value = {"id": worker, "email": "user@example.com", "is_active": True}
+
+    start = time.perf_counter()
+    for i in range(worker, keys, workers):
+        cache.set(f"key_{i}", value)
+    set_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = sum(cache.get(f"key_{i}") is not None for i in range(keys))
+    get_seconds = time.perf_counter() - start
+
+    return len(range(worker, keys, workers)), set_seconds, keys, get_seconds, hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--keys", type=int, default=2000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("fork")
+
+    for backend in BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp:
+            location = f"{tmp}/cache.db" if backend == "shared" else tmp
+
+            with context.Pool(args.workers) as pool:
+                results = pool.starmap(
+                    _worker,
+                    [
+                        (backend, location, worker, args.workers, args.keys)
+                        for worker in range(args.workers)
+                    ],
+                )
+
+        sets = sum(r[0] for r in results)
+        set_seconds = max(r[1] for r in results)
+        gets = sum(r[2] for r in results)
+        get_seconds = max(r[3] for r in results)
+        hits = sum(r[4] for r in results)
+
+        print(
+            f"{backend:>7}: set {sets / set_seconds:10.0f} ops/s | "
+            f"get {gets / get_seconds:10.0f} ops/s | hit ratio {hits / gets:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+`improved_exception_handler` against the isinstance-chain handler it replaced,
+for the errors the API answers most often. Both have to render the same JSON.
+
+Run with:
+    python -m benchmarks.bench_exception_handlers
+"""
+
+import timeit
+
+from benchmarks._django import setup_django
+
+setup_django()
+
+from django.core.exceptions import PermissionDenied  # noqa: E402
+from django.core.exceptions import ValidationError as DjangoValidationError  # noqa: E402
+from django.http import Http404  # noqa: E402
+from rest_framework import exceptions  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from rest_framework.serializers import as_serializer_error  # noqa: E402
+from rest_framework.views import exception_handler  # noqa: E402
+
+from apps.api.exception_handlers import improved_exception_handler  # noqa: E402
+from apps.common.exceptions import ApplicationError  # noqa: E402
+
+NUMBER = 20_000
+
+
+def legacy_improved_exception_handler(exc, ctx):
+    if isinstance(exc, DjangoValidationError):
+        exc = exceptions.ValidationError(as_serializer_error(exc))
+
+    if isinstance(exc, Http404):
+        exc = exceptions.NotFound()
+
+    if isinstance(exc, PermissionDenied):
+        exc = exceptions.PermissionDenied()
+
+    response = exception_handler(exc, ctx)
+
+    if response is None:
+        if isinstance(exc, ApplicationError):
+            data = {"message": exc.message, "extra": exc.extra}
+            return Response(data, status=400)
+
+        return response
+
+    if isinstance(exc.detail, (list, dict)):
+        response.data = {"detail": response.data}
+
+    if isinstance(exc, exceptions.ValidationError):
+        response.data["message"] = "Validation error"
+        response.data["extra"] = {"fields": response.data["detail"]}
+    else:
+        response.data["message"] = response.data["detail"]
+        response.data["extra"] = {}
+
+    del response.data["detail"]
+
+    return response
+
+
+CASES = {
+    "ApplicationError": ApplicationError("Nope", {"reason": "test"}),
+    "ValidationError": exceptions.ValidationError(
+        {"email": ["Enter a valid email address."], "password": ["Too short."]}
+    ),
+    "DjangoValidationError": DjangoValidationError(
+        {"email": "User with this Email already exists."}
+    ),
+    "NotAuthenticated": exceptions.NotAuthenticated(),
+    "Http404": Http404(),
+}
+
+
+def main() -> None:
+    renderer = JSONRenderer()
+
+    print(f"{'':>22} {'legacy':>10} {'registry':>10}")
+
+    for name, exc in CASES.items():
+        legacy = legacy_improved_exception_handler(exc, {})
+        current = improved_exception_handler(exc, {})
+
+        assert legacy.status_code == current.status_code
+        assert renderer.render(legacy.data) == renderer.render(current.data)
+
+        timings = [
+            min(timeit.repeat(lambda: handler(exc, {}), number=NUMBER, repeat=5))
+            for handler in (
+                legacy_improved_exception_handler,
+                improved_exception_handler,
+            )
+        ]
+
+        print(
+            f"{name:>22} "
+            + " ".join(f"{seconds / NUMBER * 1e6:7.2f} us" for seconds in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Per-call overhead of looking up a model's field map, as done in `model_update`.
+
+Run with:
+    python -m benchmarks.bench_model_field_meta
+"""
+
+import timeit
+
+from benchmarks._django import setup_django
+
+setup_django()
+
+from apps.common.utils import get_model_field_meta  # noqa: E402
+from apps.users.models import BaseUser  # noqa: E402
+
+NUMBER = 100_000
+
+
+def build_field_map() -> None:
+    {field.name: field for field in BaseUser._meta.get_fields()}
+
+
+def registry_lookup() -> None:
+    get_model_field_meta(BaseUser)
+
+
+def main() -> None:
+    for name, func in (("rebuilt", build_field_map), ("registry", registry_lookup)):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:>10}: {seconds / NUMBER * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-query overhead of QueryMetricsMiddleware's `execute_wrapper`, measured on a
+`SELECT 1` against the in-memory test database: without it, installed but outside
+of a request, & inside of one.
+
+Run with:
+    python -m benchmarks.bench_query_metrics
+"""
+
+import timeit
+
+from benchmarks._django import setup_django, test_database
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+
+from apps.common.middleware import (  # noqa: E402
+    QueryMetrics,
+    _request_metrics,
+    record_query,
+)
+
+NUMBER = 20_000
+
+
+def run_query() -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def main() -> None:
+    with test_database():
+        run_query()
+        # Installed by apps.common.db on connect
+        connection.execute_wrappers.remove(record_query)
+        bare = min(timeit.repeat(run_query, number=NUMBER, repeat=5))
+
+        connection.execute_wrappers.insert(0, record_query)
+        idle = min(timeit.repeat(run_query, number=NUMBER, repeat=5))
+
+        token = _request_metrics.set(QueryMetrics())
+        wrapped = min(timeit.repeat(run_query, number=NUMBER, repeat=5))
+        _request_metrics.reset(token)
+
+    for name, seconds in (
+        ("bare", bare),
+        ("no request", idle),
+        ("with metrics", wrapped),
+    ):
+        print(f"{name:>13}: {seconds / NUMBER * 1e6:8.2f} us/query")
+
+    print(f"{'overhead':>13}: {(wrapped - bare) / NUMBER * 1e6:8.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+`slugify_unique` vs the previous prefix-scan implementation, with N existing
+`post-N` slugs in the table.
+
+Run with:
+    python -m benchmarks.bench_slugify_unique
+"""
+
+import time
+import tracemalloc
+from itertools import count
+
+from benchmarks._django import setup_django, test_database
+
+setup_django()
+
+from django.contrib.auth.models import Group  # noqa: E402
+from django.db import models  # noqa: E402
+from django.utils.text import slugify  # noqa: E402
+
+from apps.utils.text import slugify_unique  # noqa: E402
+
+SCALES = (10, 10_000, 100_000)
+REPEAT = 5
+
+
+def slugify_unique_prefix_scan(
+    model_class: type[models.Model], text: str, slug_field="slug"
+) -> str:
+    """The implementation `slugify_unique` replaced, kept for comparison."""
+    slug = slugify(text, allow_unicode=False)
+    slug_matches = model_class._default_manager.filter(
+        **{f"{slug_field}__startswith": slug}
+    ).values_list(slug_field, flat=True)
+
+    num_of_matches = len(slug_matches)
+    if num_of_matches < 1:
+        return slug
+
+    for i in count(num_of_matches):
+        new_slug = f"{slug}-{i}"
+        if new_slug not in slug_matches:
+            break
+    return new_slug
+
+
+def measure(func) -> tuple[float, int]:
+    timings = []
+
+    for _ in range(REPEAT):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func(Group, "Post", slug_field="name")
+        timings.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def main() -> None:
+    with test_database():
+        existing = 0
+
+        for scale in SCALES:
+            Group.objects.bulk_create(
+                [
+                    Group(name="post" if i == 0 else f"post-{i}")
+                    for i in range(existing, scale)
+                ],
+                batch_size=5000,
+            )
+            existing = scale
+
+            for name, func in (
+                ("prefix scan", slugify_unique_prefix_scan),
+                ("max suffix", slugify_unique),
+            ):
+                seconds, peak = measure(func)
+                print(
+                    f"{scale:>7} slugs | {name:>11}: "
+                    f"{seconds * 1e3:9.2f} ms, peak {peak / 1024:9.1f} KiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Concurrent `user_create` writers against one SQLite file, with SQLite's defaults
+vs the tuning from config.settings.database (WAL, synchronous=NORMAL, busy_timeout,
+...), with & without the opt-in BEGIN IMMEDIATE.
+
+Every writer is a separate process (like gunicorn workers), creating users either
+in autocommit or each inside `transaction.atomic()` (like our atomic services),
+where a deferred transaction has to upgrade its read lock & may fail with
+"database is locked" instead of waiting.
+
+    python -m benchmarks.bench_sqlite_writers --writers 8 --users 200
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+VARIANTS = {
+    "sqlite defaults": {"DATABASE_SQLITE_TUNING": "False"},
+    "tuned": {"DATABASE_SQLITE_TUNING": "True"},
+    "tuned + immediate": {
+        "DATABASE_SQLITE_TUNING": "True",
+        "DATABASE_SQLITE_TRANSACTION_MODE": "IMMEDIATE",
+    },
+}
+
+
+def _setup(db_path: Path, env: dict[str, str]) -> None:
+    # Runs in a fresh (spawned) process, so settings pick up the variant's env
+    os.environ.update(env, DATABASE_URL=f"sqlite:///{db_path}")
+
+    from benchmarks._django import setup_django
+
+    setup_django()
+
+
+def _migrate(db_path: Path, env: dict[str, str]) -> None:
+    _setup(db_path, env)
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def _writer(
+    db_path: Path,
+    env: dict[str, str],
+    writer: int,
+    users: int,
+    atomic: bool,
+    barrier,
+    results,
+) -> None:
+    _setup(db_path, env)
+
+    from django.db import OperationalError, connection, transaction
+
+    from apps.users.services import user_create
+
+    connection.ensure_connection()
+    barrier.wait()
+
+    errors = 0
+    start = time.perf_counter()
+
+    for i in range(users):
+        email = f"writer{writer}-{i}@example.com"
+
+        try:
+            if atomic:
+                with transaction.atomic():
+                    user_create(email=email)
+            else:
+                user_create(email=email)
+        except OperationalError:
+            errors += 1
+
+    results.put((time.perf_counter() - start, errors))
+
+
+def run(env: dict[str, str], writers: int, users: int, atomic: bool) -> str:
+    ctx = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.sqlite3"
+
+        migrate = ctx.Process(target=_migrate, args=(db_path, env))
+        migrate.start()
+        migrate.join()
+
+        barrier = ctx.Barrier(writers)
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(
+                target=_writer,
+                args=(db_path, env, writer, users, atomic, barrier, results),
+            )
+            for writer in range(writers)
+        ]
+
+        for process in processes:
+            process.start()
+
+        outcomes = [results.get() for _ in processes]
+
+        for process in processes:
+            process.join()
+
+    elapsed = max(duration for duration, _ in outcomes)
+    errors = sum(errors for _, errors in outcomes)
+    created = writers * users - errors
+
+    return (
+        f"{created / elapsed:8.0f} users/s, {errors:5d} 'database is locked' errors, "
+        f"{elapsed:6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writer processes x {args.users} users")
+
+    for atomic in (False, True):
+        mode = "atomic" if atomic else "autocommit"
+
+        for name, env in VARIANTS.items():
+            result = run(env, args.writers, args.users, atomic)
+            print(f"{mode:>10} / {name:<17}: {result}")
+
+
+if __name__ == "__main__":
+    main()
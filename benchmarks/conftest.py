@@ -0,0 +1,313 @@
+"""
+Benchmark suite for the service layer, on pytest.
+
+Run with:
+    pytest benchmarks [--bench-scale 1k|100k|1m] [--bench-rounds 5]
+
+Every benchmark records its latency (min/median/mean/max/stddev over the rounds),
+the number of queries per call & the peak memory (tracemalloc) of a call. Results
+are saved as JSON under `.benchmarks/` (or `--bench-save <path>`), so runs can be
+compared across commits:
+
+    git checkout main && pytest benchmarks --bench-save .benchmarks/main.json
+    git checkout my-branch && pytest benchmarks \
+        --bench-compare .benchmarks/main.json --bench-threshold 10
+
+A median slower by more than the threshold (%), or more queries per call, fails the
+run. Only results of the same scale are compared.
+
+Benchmarks use the `benchmark` fixture, in the style of pytest-benchmark:
+
+    def test_user_create(benchmark):
+        benchmark(user_create, email=...)
+
+    def test_user_iter(benchmark):
+        benchmark.pedantic(lambda: list(user_iter()), rounds=1)
+
+`seeded_users` seeds the test database once per session, with `--bench-scale`
+users. The multi-process & ASGI benchmarks (bench_*.py) are plain scripts, check
+their docstrings.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from apps.users.models import BaseUser
+from apps.users.tests.factories import UserFactory
+from apps.utils.pytest_plugin import QueryRecorder
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / ".benchmarks"
+
+_results_key = pytest.StashKey[dict[str, "BenchmarkResult"]]()
+_regressions_key = pytest.StashKey[list[str]]()
+
+
+@dataclass
+class BenchmarkResult:
+    rounds: int
+    iterations: int
+    # Seconds per call
+    min: float
+    median: float
+    mean: float
+    max: float
+    stddev: float
+    queries: int
+    peak_memory_kib: float
+
+
+class Benchmark:
+    def __init__(self, *, rounds: int):
+        self.rounds = rounds
+        self.result: BenchmarkResult | None = None
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        return self.pedantic(func, args=args, kwargs=kwargs, rounds=self.rounds)
+
+    def pedantic(
+        self,
+        func: Callable,
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None,
+        *,
+        rounds: int = 1,
+        iterations: int = 1,
+    ) -> Any:
+        """
+        Runs `func` once to count its queries (which also warms up caches), then
+        `rounds` times `iterations` calls for the latency, then once more under
+        tracemalloc for the peak memory, since tracing slows everything down.
+        """
+        assert self.result is None, "Only one benchmark per test."
+
+        kwargs = kwargs or {}
+
+        with QueryRecorder().record() as recorder:
+            result = func(*args, **kwargs)
+
+        timings = []
+
+        for _ in range(rounds):
+            start = time.perf_counter()
+
+            for _ in range(iterations):
+                result = func(*args, **kwargs)
+
+            timings.append((time.perf_counter() - start) / iterations)
+
+        tracemalloc.start()
+
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.result = BenchmarkResult(
+            rounds=rounds,
+            iterations=iterations,
+            min=min(timings),
+            median=statistics.median(timings),
+            mean=statistics.mean(timings),
+            max=max(timings),
+            stddev=statistics.stdev(timings) if rounds > 1 else 0.0,
+            queries=len(recorder.queries),
+            peak_memory_kib=round(peak / 1024, 1),
+        )
+
+        return result
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-scale", choices=SCALES, default="1k")
+    group.addoption("--bench-rounds", type=int, default=5)
+    group.addoption(
+        "--bench-save",
+        default=None,
+        help="JSON results path, defaults to .benchmarks/<scale>-<commit>.json",
+    )
+    group.addoption(
+        "--bench-compare", default=None, help="JSON results to compare against."
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=10.0,
+        help="Slowdown of the median (%%) that counts as a regression.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("numprocesses", None):
+        raise pytest.UsageError(
+            "Benchmarks compete for the CPU when run in parallel, drop -n."
+        )
+
+    config.stash[_results_key] = {}
+    config.stash[_regressions_key] = []
+
+
+@pytest.fixture(scope="session")
+def bench_scale(request: pytest.FixtureRequest) -> int:
+    return SCALES[request.config.getoption("--bench-scale")]
+
+
+@pytest.fixture(scope="session")
+def seeded_users(django_db_setup, django_db_blocker, bench_scale: int) -> Iterator[int]:
+    """
+    Seeds `--bench-scale` users once per session. Benchmarks run in a transaction,
+    which is rolled back after each, so the seeded data stays the same.
+
+    The seeded users are committed, so they're deleted at the end of the session,
+    for `--reuse-db` runs to start from an empty table again.
+    """
+    with django_db_blocker.unblock():
+        users = UserFactory.create_batch_fast(bench_scale, batch_size=10_000)
+
+    yield bench_scale
+
+    with django_db_blocker.unblock():
+        BaseUser.objects.filter(pk__range=(users[0].pk, users[-1].pk)).delete()
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest):
+    bench = Benchmark(rounds=request.config.getoption("--bench-rounds"))
+
+    yield bench
+
+    if bench.result is not None:
+        request.config.stash[_results_key][request.node.nodeid] = bench.result
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    results = config.stash[_results_key]
+
+    if not results:
+        return
+
+    scale = config.getoption("--bench-scale")
+    payload = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "benchmarks": {name: asdict(result) for name, result in results.items()},
+    }
+
+    path = Path(
+        config.getoption("--bench-save")
+        or RESULTS_DIR / f"{scale}-{_git_commit()}.json"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2))
+
+    compare = config.getoption("--bench-compare")
+
+    if compare is None:
+        return
+
+    baseline = json.loads(Path(compare).read_text())
+
+    if baseline["scale"] != scale:
+        config.stash[_regressions_key].append(
+            f"Not compared, {compare} is for scale {baseline['scale']}, not {scale}."
+        )
+        return
+
+    regressions = _compare(
+        payload["benchmarks"],
+        baseline["benchmarks"],
+        threshold=config.getoption("--bench-threshold"),
+    )
+    config.stash[_regressions_key].extend(regressions)
+
+    if regressions:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config) -> None:
+    results = config.stash[_results_key]
+
+    if not results:
+        return
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<60} {'median':>12} {'stddev':>10} {'queries':>8} {'peak KiB':>10}"
+    )
+
+    for name, result in results.items():
+        terminalreporter.write_line(
+            f"{name[-60:]:<60} {_format_seconds(result.median):>12} "
+            f"{_format_seconds(result.stddev):>10} {result.queries:>8} "
+            f"{result.peak_memory_kib:>10.1f}"
+        )
+
+    for line in config.stash[_regressions_key]:
+        terminalreporter.write_line(line, red=True)
+
+
+def _compare(
+    current: dict[str, dict], baseline: dict[str, dict], *, threshold: float
+) -> list[str]:
+    regressions = []
+
+    for name, result in current.items():
+        previous = baseline.get(name)
+
+        if previous is None:
+            continue
+
+        slowdown = (result["median"] / previous["median"] - 1) * 100
+
+        if slowdown > threshold:
+            regressions.append(
+                f"REGRESSION {name}: median {_format_seconds(previous['median'])} -> "
+                f"{_format_seconds(result['median'])} (+{slowdown:.1f}%)"
+            )
+
+        if result["queries"] > previous["queries"]:
+            regressions.append(
+                f"REGRESSION {name}: queries {previous['queries']} -> "
+                f"{result['queries']}"
+            )
+
+    return regressions
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+
+    return f"{seconds * 1e6:.2f} us"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,41 @@
+import pytest
+
+from apps.common.services import model_bulk_update, model_update
+from apps.common.utils import get_model_field_meta
+from apps.users.models import BaseUser
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_model_field_meta(benchmark):
+    benchmark.pedantic(get_model_field_meta, args=(BaseUser,), iterations=10_000)
+
+
+@pytest.mark.parametrize("validate", ["full", "changed", "none"])
+def test_model_update(benchmark, seeded_users: int, validate: str):
+    user = BaseUser.objects.first()
+
+    def update():
+        # Flip a flag, so every call actually updates
+        model_update(
+            instance=user,
+            fields=["is_admin"],
+            data={"is_admin": not user.is_admin},
+            validate=validate,
+        )
+
+    benchmark(update)
+
+
+def test_model_bulk_update(benchmark, seeded_users: int):
+    users = list(BaseUser.objects.order_by("pk")[:1000])
+
+    def update():
+        model_bulk_update(
+            instances=users,
+            fields=["is_active"],
+            data_per_instance=[{"is_active": not user.is_active} for user in users],
+            validate="changed",
+        )
+
+    benchmark(update)
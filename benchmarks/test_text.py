@@ -0,0 +1,28 @@
+from collections.abc import Iterator
+
+import pytest
+from django.contrib.auth.models import Group
+
+from apps.utils.text import slugify_unique
+
+
+@pytest.fixture(scope="module")
+def seeded_slugs(django_db_setup, django_db_blocker, bench_scale: int) -> Iterator[int]:
+    # "post", "post-1", ..., so every call has to find the max of `bench_scale` rows
+    with django_db_blocker.unblock():
+        Group.objects.bulk_create(
+            [Group(name="post" if i == 0 else f"post-{i}") for i in range(bench_scale)],
+            batch_size=5000,
+        )
+
+    yield bench_scale
+
+    with django_db_blocker.unblock():
+        Group.objects.filter(name__startswith="post").delete()
+
+
+@pytest.mark.django_db
+def test_slugify_unique(benchmark, seeded_slugs: int):
+    slug = benchmark(slugify_unique, Group, "Post", slug_field="name")
+
+    assert slug == f"post-{seeded_slugs}"
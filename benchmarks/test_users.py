@@ -0,0 +1,45 @@
+from itertools import count
+
+import pytest
+
+from apps.users.models import BaseUser
+from apps.users.services import (
+    user_create,
+    user_get_login_data,
+    user_iter,
+    user_list,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def test_user_create(benchmark, seeded_users: int):
+    emails = (f"bench{i}@example.com" for i in count())
+
+    benchmark(lambda: user_create(email=next(emails)))
+
+
+def test_user_list_first_page(benchmark, seeded_users: int):
+    page = benchmark(lambda: list(user_list().order_by("-created_at", "-pk")[:50]))
+
+    assert len(page) == 50
+
+
+def test_user_list_by_email(benchmark, seeded_users: int):
+    email = BaseUser.objects.order_by("-pk").values_list("email", flat=True)[0]
+
+    users = benchmark(lambda: list(user_list(filters={"email": email})))
+
+    assert len(users) == 1
+
+
+def test_user_iter_full_scan(benchmark, seeded_users: int):
+    total = benchmark.pedantic(lambda: sum(1 for _ in user_iter()), rounds=1)
+
+    assert total == seeded_users
+
+
+def test_user_get_login_data(benchmark, seeded_users: int):
+    user = BaseUser.objects.first()
+
+    benchmark.pedantic(user_get_login_data, kwargs={"user": user}, iterations=1000)
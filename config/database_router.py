@@ -0,0 +1,102 @@
+import time
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+
+PRIMARY = "default"
+REPLICA = "replica"
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+_last_write_at: ContextVar[float | None] = ContextVar("last_write_at", default=None)
+
+
+class ReplicaRouter:
+    """
+    Sends reads marked with `replica_reads` to the "replica" alias & everything else
+    to the primary. Configured in config.settings.database.
+
+    Reads stay on the primary, even when marked, if:
+        - replica reads are disabled (`DATABASE_REPLICA_READS`, on only when a
+          `DATABASE_REPLICA_URL` is configured).
+        - we are inside a transaction, which has to see its own writes.
+        - there was a write in the current request (or task) in the last
+          `DATABASE_REPLICA_STICKY_SECONDS`, i.e. "read-your-writes", since the
+          replica may still be lagging behind.
+    """
+
+    def db_for_read(self, model, **hints) -> str | None:
+        if _replica_reads.get():
+            return replica_db_for_read()
+
+        return None
+
+    def db_for_write(self, model, **hints) -> str:
+        _last_write_at.set(time.monotonic())
+
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool | None:
+        # Both aliases hold the same data
+        if {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA}:
+            return True
+
+        return None
+
+
+def replica_db_for_read() -> str:
+    """
+    The alias to read from, for code that wants replica reads but can't rely on
+    `replica_reads` being active when the query runs (e.g. selectors returning lazy
+    querysets, which bind it with `.using()`).
+    """
+    if not settings.DATABASE_REPLICA_READS:
+        return PRIMARY
+
+    if connections[PRIMARY].in_atomic_block:
+        return PRIMARY
+
+    last_write_at = _last_write_at.get()
+
+    if (
+        last_write_at is not None
+        and time.monotonic() - last_write_at < settings.DATABASE_REPLICA_STICKY_SECONDS
+    ):
+        return PRIMARY
+
+    return REPLICA
+
+
+class replica_reads(ContextDecorator):
+    """
+    Marks the reads within as safe to serve from the replica.
+
+    with replica_reads():
+        ...
+
+    @replica_reads()
+    def some_selector(...):
+        ...
+
+    Note that querysets are lazy, so only queries that actually run within the
+    block are affected. Doesn't wrap coroutines, use it as a context manager within
+    async functions instead.
+    """
+
+    def __enter__(self):
+        self._token = _replica_reads.set(True)
+        return self
+
+    def __exit__(self, *exc):
+        _replica_reads.reset(self._token)
+        return False
+
+
+def _reset_last_write(**kwargs) -> None:
+    # Worker threads are reused across requests, so stickiness is per request
+    _last_write_at.set(None)
+
+
+request_started.connect(_reset_last_write)
@@ -18,6 +18,23 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 # CELERY_TASK_ALWAYS_EAGER = True
 # CELERY_TASK_EAGER_PROPAGATES = True
 
+# The replica gets its own test database, as a stand-in for a real one. Replica
+# reads are off by default (config.settings.database), tests turn them on as needed.
+# Without DATABASE_REPLICA_URL both aliases share a NAME, so the replica's test
+# database needs a name of its own (SQLite ones are in-memory & per process anyway).
+# pytest-django appends the xdist worker (e.g. "_gw0") to both, for `pytest -n`.
+DATABASES["replica"]["TEST"] = {  # noqa: F405
+    "NAME": (
+        None
+        if DATABASES["replica"]["ENGINE"] == "django.db.backends.sqlite3"  # noqa: F405
+        else f"test_{DATABASES['replica']['NAME']}_replica"  # noqa: F405
+    ),
+    "MIRROR": None,
+}
+
+# Fail tests for views that go over their query budget
+QUERY_BUDGET_ACTION = QueryBudgetAction.RAISE  # noqa: F405
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
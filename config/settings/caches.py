@@ -0,0 +1,79 @@
+"""
+Cache configuration, selected via the `CACHE_BACKEND` env variable.
+
+Read more here: https://docs.djangoproject.com/en/stable/topics/cache/
+
+=========================
+=== AVAILABLE BACKENDS ===
+=========================
+
+locmem      - Per-process memory. Fine for development, but every worker process gets
+              its own cold copy (16 gunicorn workers -> 16 caches).
+shared      - apps.common.cache_backends.SharedFileCache. One cache for every process
+              on the host, backed by a SQLite file with LRU eviction. Meant for
+              single-host deployments without Redis. Point `CACHE_LOCATION` at a
+              tmpfs (e.g. /dev/shm/django_cache.db) for best results.
+file        - Django's FileBasedCache. `CACHE_LOCATION` is a directory.
+redis       - Django's RedisCache. `CACHE_LOCATION` is a redis:// URL.
+memcached   - Django's PyMemcacheCache. `CACHE_LOCATION` is host:port.
+dummy       - Caches nothing.
+
+The test settings (config.django.test) always override this with LocMem.
+"""
+
+from enum import Enum
+
+from config.env import env, env_to_enum
+
+
+class CacheBackend(Enum):
+    LOCMEM = "locmem"
+    SHARED = "shared"
+    FILE = "file"
+    REDIS = "redis"
+    MEMCACHED = "memcached"
+    DUMMY = "dummy"
+
+
+CACHE_BACKEND = env_to_enum(CacheBackend, env("CACHE_BACKEND", default="locmem"))
+
+_CACHE_BACKEND_CLASSES = {
+    CacheBackend.LOCMEM: "django.core.cache.backends.locmem.LocMemCache",
+    CacheBackend.SHARED: "apps.common.cache_backends.SharedFileCache",
+    CacheBackend.FILE: "django.core.cache.backends.filebased.FileBasedCache",
+    CacheBackend.REDIS: "django.core.cache.backends.redis.RedisCache",
+    CacheBackend.MEMCACHED: "django.core.cache.backends.memcached.PyMemcacheCache",
+    CacheBackend.DUMMY: "django.core.cache.backends.dummy.DummyCache",
+}
+
+_CACHE_DEFAULT_LOCATIONS = {
+    CacheBackend.FILE: "/var/tmp/django_cache",
+    CacheBackend.REDIS: "redis://127.0.0.1:6379",
+    CacheBackend.MEMCACHED: "127.0.0.1:11211",
+}
+
+# Culling is done by Django's local backends (& ours). Redis & memcached evict on
+# their own & pass OPTIONS on to their client, which rejects these keys.
+_CACHE_CULLING_BACKENDS = {CacheBackend.LOCMEM, CacheBackend.SHARED, CacheBackend.FILE}
+
+
+def _cache_config(backend: CacheBackend) -> dict:
+    config = {
+        "BACKEND": _CACHE_BACKEND_CLASSES[backend],
+        "LOCATION": env(
+            "CACHE_LOCATION", default=_CACHE_DEFAULT_LOCATIONS.get(backend, "")
+        ),
+        "TIMEOUT": env.int("CACHE_DEFAULT_TIMEOUT", default=300),
+        "KEY_PREFIX": env("CACHE_KEY_PREFIX", default=""),
+    }
+
+    if backend in _CACHE_CULLING_BACKENDS:
+        config["OPTIONS"] = {
+            "MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=10000),
+            "CULL_FREQUENCY": env.int("CACHE_CULL_FREQUENCY", default=3),
+        }
+
+    return config
+
+
+CACHES = {"default": _cache_config(CACHE_BACKEND)}
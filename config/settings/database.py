@@ -0,0 +1,135 @@
+"""
+Database configuration, parsed from `DATABASE_URL` (and optionally
+`DATABASE_REPLICA_URL`) via django-environ.
+
+Read more here:
+    1. https://docs.djangoproject.com/en/stable/ref/settings/#databases
+    2. https://docs.djangoproject.com/en/stable/ref/databases/#persistent-connections
+    3. https://docs.djangoproject.com/en/stable/ref/databases/#connection-pool
+
+=========================
+=== CONNECTION REUSE ===
+=========================
+
+By default every connection is kept open for `DATABASE_CONN_MAX_AGE` seconds and
+reused across requests, with `CONN_HEALTH_CHECKS` making sure a connection that
+died in the meantime (e.g. a database restart) is replaced, instead of failing the
+request.
+
+With Postgres & psycopg 3 (requires `psycopg[pool]`), `DATABASE_POOL=True` switches
+to psycopg's native connection pool instead. Connections are then shared by all
+threads of a process, and `DATABASE_POOL_MIN_SIZE`/`DATABASE_POOL_MAX_SIZE` bound the
+pool per process (so multiply by the number of workers when sizing the database).
+Django doesn't allow persistent connections together with pooling, so CONN_MAX_AGE
+is 0 then.
+
+=========================
+=== READ REPLICA ===
+=========================
+
+`DATABASE_REPLICA_URL` adds a "replica" alias with the same connection settings.
+Without it, the alias points to the primary, so code can always use it.
+
+Reads are sent to it by config.database_router.ReplicaRouter, but only those marked
+with `replica_reads` (or bound via `replica_db_for_read`), and only if
+`DATABASE_REPLICA_READS` is on (the default when a replica URL is set). After a
+write, reads in the same request go to the primary for
+`DATABASE_REPLICA_STICKY_SECONDS`, so users see their own writes despite lag.
+
+=========================
+=== SQLITE TUNING ===
+=========================
+
+SQLite's defaults (rollback journal, fsync on every commit, deferred transactions)
+make concurrent gunicorn workers queue up behind each other's write locks. Unless
+`DATABASE_SQLITE_TUNING=False`, every new SQLite connection gets the pragmas below
+(applied by apps.common.db.sqlite_connection_setup on `connection_created`):
+
+journal_mode    - WAL, readers no longer block the writer & vice versa.
+synchronous     - NORMAL, safe with WAL. A power cut may lose the last commits, but
+                  never corrupts the database.
+mmap_size       - Bytes of the file read via memory mapping instead of read() calls.
+cache_size      - Page cache per connection. Negative values are in KiB.
+busy_timeout    - Milliseconds to wait for a lock before "database is locked".
+temp_store      - MEMORY, temporary tables & indices (e.g. for sorting) stay in RAM.
+
+Transactions (`transaction.atomic`) are deferred by default, i.e. they only take
+the write lock at their first write. A deferred transaction that reads first & then
+writes fails right away with "database is locked" if another writer got in between,
+without waiting for `busy_timeout`.
+
+For write-heavy deployments, `DATABASE_SQLITE_TRANSACTION_MODE=IMMEDIATE` starts
+every transaction with `BEGIN IMMEDIATE` instead. The write lock is taken upfront,
+so `busy_timeout` applies, but every `atomic()` block (read-only ones included) then
+waits for the other writers. It's opt-in for that reason.
+"""
+
+from config.env import BASE_DIR, env
+
+DATABASE_URL = env.str("DATABASE_URL", default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}")
+DATABASE_REPLICA_URL = env.str("DATABASE_REPLICA_URL", default="")
+DATABASE_REPLICA_READS = env.bool(
+    "DATABASE_REPLICA_READS", default=bool(DATABASE_REPLICA_URL)
+)
+DATABASE_REPLICA_STICKY_SECONDS = env.float(
+    "DATABASE_REPLICA_STICKY_SECONDS", default=5.0
+)
+
+DATABASE_CONN_MAX_AGE = env.int("DATABASE_CONN_MAX_AGE", default=60)
+DATABASE_CONN_HEALTH_CHECKS = env.bool("DATABASE_CONN_HEALTH_CHECKS", default=True)
+
+DATABASE_POOL = env.bool("DATABASE_POOL", default=False)
+DATABASE_POOL_MIN_SIZE = env.int("DATABASE_POOL_MIN_SIZE", default=2)
+DATABASE_POOL_MAX_SIZE = env.int("DATABASE_POOL_MAX_SIZE", default=10)
+DATABASE_POOL_TIMEOUT = env.int("DATABASE_POOL_TIMEOUT", default=10)  # seconds
+
+DATABASE_SQLITE_TUNING = env.bool("DATABASE_SQLITE_TUNING", default=True)
+DATABASE_SQLITE_TRANSACTION_MODE = env.str(
+    "DATABASE_SQLITE_TRANSACTION_MODE", default=None
+)
+DATABASE_SQLITE_PRAGMAS = (
+    {
+        "journal_mode": env.str("DATABASE_SQLITE_JOURNAL_MODE", default="WAL"),
+        "synchronous": env.str("DATABASE_SQLITE_SYNCHRONOUS", default="NORMAL"),
+        "mmap_size": env.int("DATABASE_SQLITE_MMAP_SIZE", default=128 * 1024 * 1024),
+        "cache_size": env.int("DATABASE_SQLITE_CACHE_SIZE", default=-20_000),
+        "busy_timeout": env.int("DATABASE_SQLITE_BUSY_TIMEOUT", default=5_000),
+        "temp_store": env.str("DATABASE_SQLITE_TEMP_STORE", default="MEMORY"),
+    }
+    if DATABASE_SQLITE_TUNING
+    else {}
+)
+
+
+def _database_config(url: str) -> dict:
+    config = env.db_url_config(url)
+    config["CONN_MAX_AGE"] = DATABASE_CONN_MAX_AGE
+    config["CONN_HEALTH_CHECKS"] = DATABASE_CONN_HEALTH_CHECKS
+
+    if DATABASE_POOL and config["ENGINE"] == "django.db.backends.postgresql":
+        config["CONN_MAX_AGE"] = 0
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DATABASE_POOL_MIN_SIZE,
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            "timeout": DATABASE_POOL_TIMEOUT,
+        }
+
+    if (
+        DATABASE_SQLITE_TRANSACTION_MODE
+        and config["ENGINE"] == "django.db.backends.sqlite3"
+    ):
+        config.setdefault("OPTIONS", {})["transaction_mode"] = (
+            DATABASE_SQLITE_TRANSACTION_MODE
+        )
+
+    return config
+
+
+DATABASES = {
+    "default": _database_config(DATABASE_URL),
+    "replica": _database_config(DATABASE_REPLICA_URL or DATABASE_URL),
+}
+
+DATABASE_ROUTERS = ["config.database_router.ReplicaRouter"]
+
+# DATABASES["default"]["ATOMIC_REQUESTS"] = True
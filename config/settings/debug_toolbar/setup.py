@@ -1,6 +1,6 @@
 import logging
-
-from django.urls import include, path
+from functools import cache
+from importlib.util import find_spec
 
 logger = logging.getLogger("configuration")
 
@@ -27,9 +27,17 @@ def show_toolbar(*args, **kwargs) -> bool:
     if not DEBUG_TOOLBAR_ENABLED:
         return False
 
-    try:
-        import debug_toolbar  # noqa
-    except ImportError:
+    return debug_toolbar_installed()
+
+
+@cache
+def debug_toolbar_installed() -> bool:
+    """
+    Only probes for the package, without importing it. Importing is left to Django,
+    when (and if) the app is loaded. Cached, since `show_toolbar` is called for
+    every request.
+    """
+    if find_spec("debug_toolbar") is None:
         logger.info("No installation found for: django_debug_toolbar")
         return False
 
@@ -77,6 +85,9 @@ class DebugToolbarSetup:
         if not show_toolbar():
             return urlpatterns
 
+        # Imported here, since this module is also imported by the settings, where
+        # django.urls (& the rest of Django it pulls in) isn't needed yet.
         import debug_toolbar  # noqa
+        from django.urls import include, path
 
         return urlpatterns + [path("__debug__/", include(debug_toolbar.urls))]
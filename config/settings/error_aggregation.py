@@ -0,0 +1,21 @@
+"""
+Aggregation of logged errors, done by apps.common.log_handlers.
+
+ERROR records (unhandled exceptions included) go through a `QueueHandler`, so the
+request thread only puts them on a queue. A `QueueListener` thread groups them by
+fingerprint: the exception type & the innermost frame of our code that raised it
+(or the logging call site, for records without an exception).
+
+Per fingerprint & per `ERROR_AGGREGATION_INTERVAL` seconds:
+    - The first occurrence is sent right away (e.g. to `mail_admins`).
+    - Any further ones are counted & sent as a single summary at the end of the
+      interval, e.g. "... [37x in the last 60s]".
+    - While the errors keep coming, only the summaries are sent.
+
+`ERROR_AGGREGATION_ENABLED=False` sends every error, from the request thread.
+"""
+
+from config.env import env
+
+ERROR_AGGREGATION_ENABLED = env.bool("ERROR_AGGREGATION_ENABLED", default=True)
+ERROR_AGGREGATION_INTERVAL = env.float("ERROR_AGGREGATION_INTERVAL", default=60.0)
@@ -0,0 +1,36 @@
+"""
+Per-request database metrics, collected by apps.common.middleware.QueryMetricsMiddleware.
+
+Every request gets:
+    - A `Server-Timing` header (`QUERY_METRICS_SERVER_TIMING`), so the numbers show
+      up in the browser's devtools, e.g.
+      `db;dur=4.2;desc="7 queries, 5 duplicate", total;dur=18.0`
+    - A log line on the "apps.common.middleware" logger, with the numbers as
+      key=value pairs in the message & as `extra` on the record, for structured
+      handlers.
+
+Duplicate queries are the ones with the exact same SQL (params aside) as an earlier
+query in the same request, which is what an N+1 looks like.
+
+=========================
+=== QUERY BUDGETS ===
+=========================
+
+Views can declare the most queries they are expected to run, via the
+`apps.common.middleware.query_budget` decorator (works on function & class based
+views). `QUERY_BUDGET_DEFAULT` applies to views without one (none by default).
+Going over the budget either logs a warning, or raises `QueryBudgetExceeded`
+(`QUERY_BUDGET_ACTION`), which the test settings use.
+"""
+
+from apps.common.enums import QueryBudgetAction
+from config.env import env, env_to_enum
+
+QUERY_METRICS_ENABLED = env.bool("QUERY_METRICS_ENABLED", default=True)
+QUERY_METRICS_SERVER_TIMING = env.bool("QUERY_METRICS_SERVER_TIMING", default=True)
+QUERY_METRICS_LOG_LEVEL = env.str("QUERY_METRICS_LOG_LEVEL", default="INFO")
+
+QUERY_BUDGET_DEFAULT = env.int("QUERY_BUDGET_DEFAULT", default=None)
+QUERY_BUDGET_ACTION = env_to_enum(
+    QueryBudgetAction, env("QUERY_BUDGET_ACTION", default="warn")
+)
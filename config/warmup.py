@@ -0,0 +1,177 @@
+"""
+Warms up a process before it serves traffic, so the first requests after a deploy
+don't pay for lazy initialization (imports, URL resolvers, model metadata, database
+connections), and so the warmed state is shared copy-on-write between forked workers.
+
+With gunicorn (`preload_app = True`), in gunicorn.conf.py:
+
+    def when_ready(server):
+        from config.warmup import warmup
+
+        # In the master, before forking. No connections, they can't be shared.
+        warmup(connect=False, freeze=True)
+
+    def post_fork(server, worker):
+        from config.warmup import warmup
+
+        # In every worker, only what is per process.
+        warmup(imports=False, connect=True, urls=["/api/users/"])
+
+Warmup only helps the process it runs in, so it has to run inside every worker (or
+in the master, before forking). Without fork hooks (e.g. uvicorn workers), call it
+from the entry point, which every worker imports, e.g. at the end of config/asgi.py:
+
+    application = get_asgi_application()
+    warmup(urls=["/api/users/"])
+
+`python manage.py warmup` runs it in a process of its own, which is then gone, so
+it doesn't warm a server. Use it to check that the warmup works & how long each step
+takes.
+"""
+
+import gc
+import importlib
+import logging
+import pkgutil
+import time
+from collections.abc import Callable, Iterable
+from typing import TypedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+
+from apps.common.utils import get_model_field_meta
+
+logger = logging.getLogger(__name__)
+
+# Not needed at runtime & tests may even need test-only dependencies
+SKIPPED_SUBMODULES = {"tests", "migrations", "management"}
+
+
+class WarmupReport(TypedDict):
+    # Step -> seconds
+    timings: dict[str, float]
+    modules: int
+    models: int
+    connections: list[str]
+    # Path -> status code
+    requests: dict[str, int]
+
+
+def warmup(
+    *,
+    imports: bool = True,
+    connect: bool = True,
+    urls: Iterable[str] = (),
+    freeze: bool = False,
+) -> WarmupReport:
+    """
+    Steps, in order:
+        1. `imports` - imports every module of the local apps & builds the URL
+           resolvers & model metadata caches. Safe to run before forking.
+        2. `connect` - opens a connection (or the pool) for every database alias.
+           Connections can't be shared between processes, so run this after fork.
+        3. `urls` - sends a GET to each of them, through the whole middleware stack.
+           Opens connections as well, so after fork only.
+        4. `freeze` - moves everything allocated so far to the GC's permanent
+           generation (`gc.freeze()`), so collections in the forked workers don't
+           write to (and therefore copy) the pages shared with the master. Use it
+           as the last thing before forking.
+    """
+    report = WarmupReport(timings={}, modules=0, models=0, connections=[], requests={})
+
+    if imports:
+        report["modules"] = _timed(report, "imports", _import_app_modules)
+        _timed(report, "urls", _populate_url_resolvers)
+        report["models"] = _timed(report, "models", _prime_model_meta)
+
+    if connect:
+        report["connections"] = _timed(report, "connections", _open_connections)
+
+    urls = list(urls)
+
+    if urls:
+        report["requests"] = _timed(report, "requests", lambda: _send_requests(urls))
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    logger.info("Warmup done: %s", report)
+
+    return report
+
+
+def _timed[T](report: WarmupReport, step: str, func: Callable[[], T]) -> T:
+    start = time.perf_counter()
+    result = func()
+    report["timings"][step] = time.perf_counter() - start
+
+    return result
+
+
+def _import_app_modules() -> int:
+    count = 0
+
+    for app_config in apps.get_app_configs():
+        if not app_config.name.startswith(settings.LOCAL_APP_DIR_PREFIX):
+            continue
+
+        for module in pkgutil.walk_packages(
+            [app_config.path], prefix=f"{app_config.name}."
+        ):
+            if SKIPPED_SUBMODULES.intersection(module.name.split(".")):
+                continue
+
+            importlib.import_module(module.name)
+            count += 1
+
+    return count
+
+
+def _populate_url_resolvers() -> None:
+    resolver = get_resolver()
+    # Builds the lookup tables of every (included) resolver & compiles the patterns
+    resolver.reverse_dict  # noqa: B018
+    resolver.namespace_dict  # noqa: B018
+    resolver.app_dict  # noqa: B018
+
+
+def _prime_model_meta() -> int:
+    models = apps.get_models(include_auto_created=True)
+
+    for model in models:
+        opts = model._meta
+        opts.get_fields()
+        opts._forward_fields_map  # noqa: B018
+        opts.fields_map  # noqa: B018
+        opts.related_objects  # noqa: B018
+        get_model_field_meta(model)
+
+    return len(models)
+
+
+def _open_connections() -> list[str]:
+    aliases = []
+
+    for connection in connections.all():
+        connection.ensure_connection()
+        aliases.append(connection.alias)
+
+    return aliases
+
+
+def _send_requests(urls: list[str]) -> dict[str, int]:
+    # The test client is the simplest way through the whole stack, but it isn't
+    # needed for anything else, so the test framework is only imported when used
+    from django.test import Client
+
+    host = next(
+        (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+        "localhost",
+    )
+    client = Client(HTTP_HOST=host, raise_request_exception=False)
+
+    return {url: client.get(url).status_code for url in urls}
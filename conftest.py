@@ -0,0 +1 @@
+pytest_plugins = ["apps.utils.pytest_plugin"]